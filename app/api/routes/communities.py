@@ -1,8 +1,9 @@
 import json
+import math
 import re
 from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
@@ -12,12 +13,21 @@ from app.schemas.community import (
     CommunityDetailResponse,
     CommunityMetricsResponse,
     CommunityResponse,
+    RentHistoryPoint,
+    RentHistoryResponse,
     ReviewKeywordConfigResponse,
     ReviewResponse,
 )
 from app.schemas.insight import CommunityInsightRequest, CommunityInsightResponse
+from app.services.fetchers.zillow_zori import compute_city_trends, load_zori_store
 from app.services.insight_service import generate_community_insight
-from app.services.ingest_service import ensure_metrics_fresh, ensure_reviews_fresh
+from app.services.ingest_service import (
+    ensure_metrics_fresh,
+    ensure_reviews_fresh,
+    claim_background_refresh,
+    is_metrics_stale,
+    refresh_metrics_in_background,
+)
 from app.services.review_keyword_config import get_review_keyword_config
 from app.services.review_filter_service import filter_reviews_for_community_ui
 
@@ -36,16 +46,73 @@ def get_community_review_keyword_config() -> ReviewKeywordConfigResponse:
 
 
 @router.get("/{community_id}", response_model=CommunityDetailResponse)
-def get_community(community_id: str, db: Session = Depends(get_db)) -> CommunityDetailResponse:
+def get_community(
+    community_id: str,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    settings: Settings = Depends(get_settings),
+) -> CommunityDetailResponse:
     community = crud.get_community(db, community_id)
     if community is None:
         raise HTTPException(status_code=404, detail="Community not found")
 
+    metrics = crud.get_metrics(db, community_id)
+    if metrics is not None and settings.serve_stale_metrics:
+        # Serve what we have; only a community without metrics blocks on fetchers.
+        if is_metrics_stale(metrics) and claim_background_refresh(community_id):
+            background_tasks.add_task(refresh_metrics_in_background, community_id)
+        return _build_detail_response(community, metrics)
+
     ensure_metrics_fresh(db, community_id)
     metrics = crud.get_metrics(db, community_id)
     return _build_detail_response(community, metrics)
 
 
+@router.get("/{community_id}/rent-history", response_model=RentHistoryResponse)
+def get_community_rent_history(
+    community_id: str,
+    months: int = Query(default=36, ge=1, le=240),
+    db: Session = Depends(get_db),
+) -> RentHistoryResponse:
+    community = crud.get_community(db, community_id)
+    if community is None:
+        raise HTTPException(status_code=404, detail="Community not found")
+
+    # Same city fallback as the metrics refresh.
+    city = community.city or "Irvine"
+    state = community.state or "CA"
+    store = load_zori_store()
+    series = store.lookup(city, state) if store is not None else None
+    trends = compute_city_trends(store, city, state) if series is not None else None
+    if series is None or trends is None:
+        raise HTTPException(status_code=404, detail="No ZORI rent history for this city")
+
+    start = max(0, len(store.dates) - months)
+    history = [
+        RentHistoryPoint(
+            month=month,
+            rent=None if math.isnan(value) else round(float(value), 2),
+        )
+        for month, value in zip(store.dates[start:], series[start:])
+    ]
+    return RentHistoryResponse(
+        community_id=community_id,
+        city=city,
+        state=state,
+        latest_month=trends.latest_date,
+        latest_rent=(
+            round(trends.latest_rent, 2) if trends.latest_rent is not None else None
+        ),
+        rent_trend_3m_pct=trends.trend_pct[3],
+        rent_trend_6m_pct=trends.trend_pct[6],
+        rent_trend_12m_pct=trends.trend_pct[12],
+        rent_trend_24m_pct=trends.trend_pct[24],
+        rent_volatility_12m_pct=trends.volatility_12m_pct,
+        seasonally_adjusted_rent=trends.seasonally_adjusted_rent,
+        history=history,
+    )
+
+
 @router.get("/{community_id}/reviews", response_model=list[ReviewResponse])
 async def get_community_reviews(
     community_id: str,
@@ -141,6 +208,7 @@ def _build_detail_response(
             poi_demand_density_per_km2=metrics.poi_demand_density_per_km2,
             overall_confidence=metrics.overall_confidence,
             updated_at=metrics.updated_at,
+            is_stale=is_metrics_stale(metrics),
         )
 
     return CommunityDetailResponse(community=community_payload, metrics=metrics_payload)
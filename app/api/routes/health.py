@@ -1,8 +1,41 @@
+from typing import Any
+
 from fastapi import APIRouter
 
+from app.services.commute_service import commute_cache_stats
+from app.services.fetchers.crimegrade import crimegrade_cache_stats
+from app.services.fetchers.overpass_osm import (
+    overpass_cache_stats,
+    overpass_endpoint_stats,
+)
+from app.services.ingest_service import metrics_refresh_stats
+from app.utils.provider_guard import provider_guard_stats
+
 router = APIRouter()
 
 
 @router.get("/health")
 def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/health/refresh")
+def refresh_health() -> dict[str, int]:
+    return metrics_refresh_stats()
+
+
+@router.get("/health/caches")
+def cache_health() -> dict[str, dict[str, int]]:
+    return {
+        "overpass": overpass_cache_stats(),
+        "commute": commute_cache_stats(),
+        "crimegrade": crimegrade_cache_stats(),
+    }
+
+
+@router.get("/health/providers")
+def provider_health() -> dict[str, Any]:
+    return {
+        "guards": provider_guard_stats(),
+        "overpass_endpoints": overpass_endpoint_stats(),
+    }
@@ -7,6 +7,51 @@ class Settings(BaseSettings):
     database_url: str
     app_env: str = "dev"
     metrics_ttl_hours: int = 24
+    # Per-source overrides of metrics_ttl_hours; unlisted sources use the default.
+    metrics_source_ttl_hours: dict[str, int] = {
+        "rent": 24 * 30,
+        "night_activity": 24 * 30,
+        "crime": 24 * 7,
+        "grocery": 24 * 7,
+        "parking": 24 * 7,
+        "noise": 24 * 7,
+        "youtube": 24 * 7,
+    }
+    # Sources attempted without producing a value are retried after this
+    # many hours instead of waiting out their full TTL.
+    metrics_retry_ttl_hours: int = 1
+    # Total wall-clock budget for one community refresh; providers run in parallel.
+    ingest_deadline_sec: float = 25.0
+    # Serve expired metrics immediately and refresh them after the response.
+    serve_stale_metrics: bool = True
+
+    # Shared outbound HTTP pools (one per API host).
+    http_timeout_sec: float = 10.0
+    http_connect_timeout_sec: float = 5.0
+    http_max_connections_per_host: int = 10
+    http_max_keepalive_per_host: int = 5
+    http_keepalive_expiry_sec: float = 30.0
+
+    # Per-provider rate limits (requests, or quota units for YouTube) and
+    # circuit breakers. Keys: rate_per_sec, burst, max_wait_sec,
+    # failure_threshold, reset_sec; missing keys use the defaults below.
+    provider_limits: dict[str, dict[str, float]] = {
+        "crimegrade": {"rate_per_sec": 0.8, "burst": 1},
+        "nominatim": {"rate_per_sec": 1.0, "burst": 1},
+        # 10,000 quota units per day; search costs 100 units, comment pages 1.
+        "youtube": {"rate_per_sec": 10000 / 86400, "burst": 10000},
+        "google_routes": {"rate_per_sec": 50.0, "burst": 50},
+        "google_places": {"rate_per_sec": 10.0, "burst": 10},
+        # Free plan: 40 directions/matrix requests per minute.
+        "openrouteservice": {"rate_per_sec": 40 / 60, "burst": 5},
+        "overpass": {"rate_per_sec": 1.0, "burst": 2},
+    }
+    provider_max_wait_sec: float = 5.0
+    provider_breaker_failure_threshold: int = 5
+    provider_breaker_reset_sec: float = 30.0
+    # "sqlite" shares budgets and breakers between workers on one host; "memory" is per process.
+    provider_state_backend: str = "sqlite"
+    provider_state_path: str = "data/cache/providers.sqlite3"
 
     # Routing / commute APIs
     google_maps_api_key: str | None = None
@@ -14,6 +59,27 @@ class Settings(BaseSettings):
     commute_destination_lat: float = 33.6405  # UCI default
     commute_destination_lng: float = -117.8443
     prefer_google_commute: bool = True
+    # Per-pair commute cache shared by single lookups and matrix refreshes.
+    commute_cache_enabled: bool = True
+    commute_cache_path: str = "data/cache/commute.sqlite3"
+    commute_cache_ttl_hours: int = 24
+    commute_cache_max_entries: int = 20000
+    # Origins/destinations are snapped to geohash cells (7 ~ 150 m) and
+    # driving/transit answers are bucketed by local time of day.
+    commute_cache_geohash_precision: int = 7
+    commute_cache_bucket_hours: int = 3
+    commute_cache_timezone: str = "America/Los_Angeles"
+
+    # Parsed CrimeGrade pages per slug; pages without a rate (incl. 404s) expire sooner.
+    crimegrade_cache_enabled: bool = True
+    crimegrade_cache_path: str = "data/cache/crimegrade.sqlite3"
+    crimegrade_cache_ttl_days: int = 7
+    crimegrade_negative_ttl_hours: int = 72
+    crimegrade_cache_max_entries: int = 5000
+
+    # Nominatim results persisted in the geocode_cache table; misses expire sooner.
+    geocode_cache_ttl_days: int = 30
+    geocode_negative_ttl_hours: int = 6
 
     # Open data / external providers
     socrata_app_token: str | None = None
@@ -31,6 +97,26 @@ class Settings(BaseSettings):
     viirs_bbox_radius_km: float = 10.0
     viirs_local_radiance_tif: str = "data/viirs_nightlights_2025-12_tile_75N180W/avg_radiance.tif"
     viirs_sample_radius_km: float = 2.0
+    # Cropped subset written by scripts.prepare_viirs_tile; preferred over the
+    # full tile when present. Boxes are (south, west, north, east).
+    viirs_service_area_tif: str = "data/viirs/service_area_radiance.tif"
+    viirs_service_area_bboxes: list[tuple[float, float, float, float]] = [
+        (33.55, -118.00, 33.80, -117.65),  # Irvine / Costa Mesa
+    ]
+    # Summed-area table sidecar (<tif>.sat.npy) for constant-time window means;
+    # built automatically only for rasters up to this many pixels.
+    viirs_sat_enabled: bool = True
+    viirs_sat_max_build_pixels: int = 16_000_000
+    # "overpass" (public mirrors) or "local" (GeoJSON extract + grid index).
+    osm_backend: str = "overpass"
+    osm_local_extract_path: str = "data/osm/service_area.geojsonseq"
+    # Start a second Overpass mirror if the first has not answered in time.
+    overpass_hedge_enabled: bool = True
+    overpass_hedge_delay_sec: float = 1.5
+    overpass_cache_enabled: bool = True
+    overpass_cache_path: str = "data/cache/overpass.sqlite3"
+    overpass_cache_ttl_hours: int = 24 * 7
+    overpass_cache_max_entries: int = 5000
     reddit_client_id: str | None = None
     reddit_client_secret: str | None = None
 
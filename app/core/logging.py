@@ -6,3 +6,5 @@ def configure_logging() -> None:
         level=logging.INFO,
         format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
     )
+    # httpx logs every request URL at INFO, including API keys in query strings.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
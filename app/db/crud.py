@@ -1,9 +1,12 @@
 import json
 import re
+from collections.abc import Iterable
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, load_only
 
 from app.db.models import (
@@ -11,8 +14,13 @@ from app.db.models import (
     CommunityComparison,
     CommunityMetrics,
     DimensionScore,
+    GeocodeCache,
     ReviewPost,
 )
+from app.utils.batching import chunked
+
+REVIEW_UPSERT_CHUNK_SIZE = 500
+
 
 def get_community(db: Session, community_id: str) -> Community | None:
     stmt = select(Community).where(Community.community_id == community_id)
@@ -120,6 +128,55 @@ def create_community(
 
 
 def upsert_metrics(db: Session, community_id: str, payload: dict) -> CommunityMetrics:
+    """
+    Inserts or updates one metrics row with a native INSERT ... ON CONFLICT
+    DO UPDATE ... RETURNING, so concurrent refreshers cannot both INSERT.
+    Only the keys present in payload are written.
+    """
+    return upsert_metrics_bulk(db, {community_id: payload})[0]
+
+
+def upsert_metrics_bulk(
+    db: Session, payloads: dict[str, dict]
+) -> list[CommunityMetrics]:
+    """
+    Bulk variant of upsert_metrics for many communities, committed once.
+    Payloads sharing the same keys go out as one multi-row statement.
+    Returns the written rows in the order of payloads.
+    """
+    if not payloads:
+        return []
+    insert = _dialect_insert(db)
+    if insert is None:
+        return [
+            _upsert_metrics_orm(db, community_id, payload)
+            for community_id, payload in payloads.items()
+        ]
+
+    columns = CommunityMetrics.__table__.columns.keys()
+    now = datetime.utcnow()
+    groups: dict[tuple[str, ...], list[dict]] = {}
+    for community_id, payload in payloads.items():
+        values = {key: value for key, value in payload.items() if key in columns}
+        values["community_id"] = community_id
+        values["updated_at"] = now
+        groups.setdefault(tuple(sorted(values)), []).append(values)
+
+    rows: dict[str, CommunityMetrics] = {}
+    for keys, values in groups.items():
+        stmt = insert(CommunityMetrics).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CommunityMetrics.community_id],
+            set_={key: stmt.excluded[key] for key in keys if key != "community_id"},
+        ).returning(CommunityMetrics)
+        result = db.execute(stmt, execution_options={"populate_existing": True})
+        for row in result.scalars():
+            rows[row.community_id] = row
+    db.commit()
+    return [rows[community_id] for community_id in payloads]
+
+
+def _upsert_metrics_orm(db: Session, community_id: str, payload: dict) -> CommunityMetrics:
     metrics = get_metrics(db, community_id)
     if metrics is None:
         metrics = CommunityMetrics(community_id=community_id)
@@ -167,6 +224,64 @@ def upsert_dimension_score(
     return row
 
 
+def upsert_dimension_scores(db: Session, scores: list[dict]) -> int:
+    """
+    Writes many dimension scores, for one or many communities, with a single
+    INSERT ... ON CONFLICT (community_id, dimension) DO UPDATE and one commit.
+    Each item carries community_id, dimension, score_0_100, summary, details
+    and optionally data_origin (default "mixed"). Returns the rows written.
+    """
+    now = datetime.utcnow()
+    # Postgres rejects a statement that touches the same key twice; last one wins.
+    rows_by_key: dict[tuple[str, str], dict] = {}
+    for score in scores:
+        key = (score["community_id"], score["dimension"])
+        rows_by_key[key] = {
+            "score_id": uuid4().hex,
+            "community_id": score["community_id"],
+            "dimension": score["dimension"],
+            "score_0_100": score["score_0_100"],
+            "summary": score["summary"],
+            "details_json": json.dumps(score["details"], ensure_ascii=True),
+            "data_origin": score.get("data_origin", "mixed"),
+            "updated_at": now,
+        }
+    if not rows_by_key:
+        return 0
+
+    insert = _dialect_insert(db)
+    if insert is None:
+        for row in rows_by_key.values():
+            upsert_dimension_score(
+                db,
+                community_id=row["community_id"],
+                dimension=row["dimension"],
+                score_0_100=row["score_0_100"],
+                summary=row["summary"],
+                details=json.loads(row["details_json"]),
+                data_origin=row["data_origin"],
+            )
+        return len(rows_by_key)
+
+    stmt = insert(DimensionScore).values(list(rows_by_key.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DimensionScore.community_id, DimensionScore.dimension],
+        set_={
+            column: stmt.excluded[column]
+            for column in (
+                "score_0_100",
+                "summary",
+                "details_json",
+                "data_origin",
+                "updated_at",
+            )
+        },
+    )
+    db.execute(stmt)
+    db.commit()
+    return len(rows_by_key)
+
+
 def get_dimension_scores(db: Session, community_id: str) -> list[DimensionScore]:
     stmt = (
         select(DimensionScore)
@@ -188,6 +303,54 @@ def get_reviews_by_community(
     return list(db.execute(stmt).scalars().all())
 
 
+def get_youtube_comments(db: Session, community_id: str) -> str | None:
+    """The raw comment blob alone, without loading the metrics row."""
+    stmt = select(CommunityMetrics.youtube_comments).where(
+        CommunityMetrics.community_id == community_id
+    )
+    return db.execute(stmt).scalar_one_or_none()
+
+
+def get_review_watermark(
+    db: Session, community_id: str
+) -> tuple[str | None, str | None] | None:
+    """(youtube_comments_hash, reviews_materialized_hash) without loading the blob."""
+    stmt = select(
+        CommunityMetrics.youtube_comments_hash,
+        CommunityMetrics.reviews_materialized_hash,
+    ).where(CommunityMetrics.community_id == community_id)
+    row = db.execute(stmt).one_or_none()
+    return (row[0], row[1]) if row is not None else None
+
+
+def set_review_watermark(db: Session, community_id: str, comments_hash: str) -> None:
+    """
+    Records comments_hash as materialized. The blob's own hash is only
+    backfilled when missing, so a newer blob written by a concurrent refresh
+    keeps its hash and is picked up next time.
+    """
+    db.execute(
+        update(CommunityMetrics)
+        .where(CommunityMetrics.community_id == community_id)
+        .values(
+            youtube_comments_hash=func.coalesce(
+                CommunityMetrics.youtube_comments_hash, comments_hash
+            ),
+            reviews_materialized_hash=comments_hash,
+        )
+    )
+    db.commit()
+
+
+def get_review_external_ids(db: Session, community_id: str, platform: str) -> set[str]:
+    stmt = select(ReviewPost.external_id).where(
+        ReviewPost.community_id == community_id,
+        ReviewPost.platform == platform,
+        ReviewPost.external_id.isnot(None),
+    )
+    return set(db.execute(stmt).scalars().all())
+
+
 def get_reviews_count(db: Session, community_id: str) -> int:
     stmt = select(ReviewPost.post_id).where(ReviewPost.community_id == community_id)
     return len(db.execute(stmt).scalars().all())
@@ -238,12 +401,73 @@ def create_comparison(
 
 
 def upsert_review_posts(
-    db: Session, community_id: str, platform: str, reviews: list[dict]
+    db: Session, community_id: str, platform: str, reviews: Iterable[dict]
 ) -> int:
     """
-    reviews: list of dicts with 'id', 'text', 'published_at'
-    Returns count of new insertions.
+    reviews: dicts with 'id', 'text', 'published_at' and optionally 'url',
+    'author_name', 'like_count', 'parent_id'; generators are streamed.
+    Writes REVIEW_UPSERT_CHUNK_SIZE rows per INSERT ... ON CONFLICT on
+    (community_id, platform, external_id); existing posts only get their
+    empty url/author/likes/parent filled in. Returns count of new insertions.
     """
+    insert = _dialect_insert(db)
+    if insert is None:
+        return _upsert_review_posts_orm(db, community_id, platform, list(reviews))
+
+    table = ReviewPost.__table__
+    inserted = 0
+    seen: set[str] = set()
+    for chunk in chunked(reviews, REVIEW_UPSERT_CHUNK_SIZE):
+        values = []
+        for r in chunk:
+            # One statement may not touch the same key twice; first one wins.
+            if r["id"] in seen:
+                continue
+            seen.add(r["id"])
+            values.append(
+                {
+                    "post_id": str(uuid4()),
+                    "community_id": community_id,
+                    "platform": platform,
+                    "external_id": r["id"],
+                    "url": r.get("url"),
+                    "body_text": r["text"],
+                    "posted_at": _review_posted_at(r.get("published_at")),
+                    "author_name": r.get("author_name"),
+                    "like_count": r.get("like_count"),
+                    "parent_id": r.get("parent_id"),
+                }
+            )
+        if not values:
+            continue
+
+        stmt = insert(ReviewPost).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.community_id, table.c.platform, table.c.external_id],
+            index_where=table.c.external_id.isnot(None),
+            set_={
+                "url": func.coalesce(func.nullif(table.c.url, ""), stmt.excluded.url),
+                "author_name": func.coalesce(
+                    func.nullif(table.c.author_name, ""), stmt.excluded.author_name
+                ),
+                "like_count": func.coalesce(table.c.like_count, stmt.excluded.like_count),
+                "parent_id": func.coalesce(
+                    func.nullif(table.c.parent_id, ""), stmt.excluded.parent_id
+                ),
+            },
+        ).returning(table.c.post_id)
+        new_ids = {row["post_id"] for row in values}
+        # Conflicting rows return their existing post_id, not the one generated here.
+        inserted += sum(
+            1 for post_id in db.execute(stmt).scalars() if post_id in new_ids
+        )
+    db.commit()
+    return inserted
+
+
+def _upsert_review_posts_orm(
+    db: Session, community_id: str, platform: str, reviews: list[dict]
+) -> int:
     incoming_ids = [r["id"] for r in reviews]
     if not incoming_ids:
         return 0
@@ -271,17 +495,6 @@ def upsert_review_posts(
             if not existing_post.parent_id and r.get("parent_id"):
                 existing_post.parent_id = r.get("parent_id")
         elif r["id"] not in existing_ids:
-            # Parse datetime if available, else now
-            posted_at = datetime.utcnow()
-            if r.get("published_at"):
-                try:
-                    # YouTube returns ISO 8601 (e.g. 2023-01-01T12:00:00Z)
-                    posted_at = datetime.fromisoformat(
-                        r["published_at"].replace("Z", "+00:00")
-                    )
-                except ValueError:
-                    pass
-
             post = ReviewPost(
                 post_id=str(uuid4()),
                 community_id=community_id,
@@ -289,7 +502,7 @@ def upsert_review_posts(
                 external_id=r["id"],
                 url=r.get("url"),
                 body_text=r["text"],
-                posted_at=posted_at,
+                posted_at=_review_posted_at(r.get("published_at")),
                 author_name=r.get("author_name"),
                 like_count=r.get("like_count"),
                 parent_id=r.get("parent_id"),
@@ -302,6 +515,63 @@ def upsert_review_posts(
     return len(new_posts)
 
 
+def _review_posted_at(published_at: str | None) -> datetime:
+    # Parse datetime if available, else now
+    if published_at:
+        try:
+            # YouTube returns ISO 8601 (e.g. 2023-01-01T12:00:00Z)
+            return datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+    return datetime.utcnow()
+
+
+def get_geocode_cache_entries(
+    db: Session, query_keys: list[str]
+) -> dict[str, GeocodeCache]:
+    if not query_keys:
+        return {}
+    stmt = select(GeocodeCache).where(GeocodeCache.query_key.in_(query_keys))
+    return {row.query_key: row for row in db.execute(stmt).scalars().all()}
+
+
+def upsert_geocode_cache(
+    db: Session,
+    query_key: str,
+    query: str,
+    result: dict | None,
+    fetched_at: datetime,
+    expires_at: datetime,
+) -> None:
+    values = {
+        "query": query,
+        "result_json": json.dumps(result) if result is not None else None,
+        "fetched_at": fetched_at,
+        "expires_at": expires_at,
+    }
+    row = db.get(GeocodeCache, query_key)
+    if row is None:
+        db.add(GeocodeCache(query_key=query_key, **values))
+    else:
+        for key, value in values.items():
+            setattr(row, key, value)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker cached the same query first; its answer is as good.
+        db.rollback()
+
+
+def _dialect_insert(db: Session):
+    """INSERT construct with ON CONFLICT support for the bound dialect, if any."""
+    name = db.get_bind().dialect.name
+    if name == "postgresql":
+        return postgresql.insert
+    if name == "sqlite":
+        return sqlite.insert
+    return None
+
+
 def _to_slug(raw: str) -> str:
     value = raw.strip().lower()
     value = re.sub(r"[^a-z0-9]+", "-", value)
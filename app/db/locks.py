@@ -0,0 +1,48 @@
+import hashlib
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import func, select
+
+from app.db.database import engine
+
+ADVISORY_LOCK_POLL_SEC = 0.25
+
+
+@contextmanager
+def advisory_lock(key: str, timeout_sec: float) -> Iterator[bool]:
+    """
+    Holds a PostgreSQL session-level advisory lock for key on a dedicated
+    connection so it survives the caller's commits. Yields False when the lock
+    could not be taken within timeout_sec. Other databases have no
+    cross-process lock and always yield True.
+    """
+    if engine.dialect.name != "postgresql":
+        yield True
+        return
+
+    lock_id = _lock_id(key)
+    deadline = time.monotonic() + max(0.0, timeout_sec)
+    with engine.connect() as conn:
+        acquired = False
+        while True:
+            acquired = bool(
+                conn.execute(select(func.pg_try_advisory_lock(lock_id))).scalar()
+            )
+            conn.commit()
+            if acquired or time.monotonic() >= deadline:
+                break
+            time.sleep(ADVISORY_LOCK_POLL_SEC)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                conn.execute(select(func.pg_advisory_unlock(lock_id)))
+                conn.commit()
+
+
+def _lock_id(key: str) -> int:
+    # Advisory locks take a signed 64-bit key.
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
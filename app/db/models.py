@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Float, String, Text
+from sqlalchemy import Boolean, DateTime, Float, Index, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.database import Base
@@ -41,10 +41,19 @@ class CommunityMetrics(Base):
     parking_capacity_per_km2: Mapped[float | None] = mapped_column(Float)
     poi_demand_density_per_km2: Mapped[float | None] = mapped_column(Float)
 
+    # Raw YouTube payloads are large, so they are deferred: they load on
+    # first access (both together) instead of with every metrics read.
     # Storing a list of video IDs as a JSON string
-    youtube_video_ids: Mapped[str | None] = mapped_column(Text)
+    youtube_video_ids: Mapped[str | None] = mapped_column(
+        Text, deferred=True, deferred_group="youtube"
+    )
     # Storing aggregated comments as a JSON string
-    youtube_comments: Mapped[str | None] = mapped_column(Text)
+    youtube_comments: Mapped[str | None] = mapped_column(
+        Text, deferred=True, deferred_group="youtube"
+    )
+    # sha256 of youtube_comments, and the hash last materialized into review_post
+    youtube_comments_hash: Mapped[str | None] = mapped_column(String(64))
+    reviews_materialized_hash: Mapped[str | None] = mapped_column(String(64))
     
     overall_confidence: Mapped[float | None] = mapped_column(Float)
     details_json: Mapped[str | None] = mapped_column(Text)
@@ -52,6 +61,10 @@ class CommunityMetrics(Base):
 
 class DimensionScore(Base):
     __tablename__ = "dimension_score"
+    # One current row per community and dimension; bulk upserts conflict on it.
+    __table_args__ = (
+        Index("ux_dimension_score_comm_dim", "community_id", "dimension", unique=True),
+    )
 
     score_id: Mapped[str] = mapped_column(String(64), primary_key=True)
     community_id: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
@@ -86,6 +99,18 @@ class CommunityComparison(Base):
 
 class ReviewPost(Base):
     __tablename__ = "review_post"
+    # Matches sql/1_create_tables.sql; bulk review upserts conflict on it.
+    __table_args__ = (
+        Index(
+            "ux_review_post_platform_external",
+            "community_id",
+            "platform",
+            "external_id",
+            unique=True,
+            postgresql_where=text("external_id IS NOT NULL"),
+            sqlite_where=text("external_id IS NOT NULL"),
+        ),
+    )
 
     post_id: Mapped[str] = mapped_column(String(64), primary_key=True)
     community_id: Mapped[str] = mapped_column(String(64), nullable=False)
@@ -107,3 +132,15 @@ class ReviewPost(Base):
     ai_filter_prompt_version: Mapped[str | None] = mapped_column(String(32))
     ai_filter_text_hash: Mapped[str | None] = mapped_column(String(64))
     ai_filter_checked_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+
+class GeocodeCache(Base):
+    __tablename__ = "geocode_cache"
+
+    # Lower-cased, whitespace-collapsed query after the Irvine-bias rewrite.
+    query_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    query: Mapped[str] = mapped_column(Text, nullable=False)
+    # Full geocode result as JSON; NULL records a negative (no match) lookup.
+    result_json: Mapped[str | None] = mapped_column(Text)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
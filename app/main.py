@@ -1,4 +1,6 @@
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,12 +8,20 @@ from fastapi.responses import JSONResponse
 
 from app.api.routes import agent, chat, communities, compare, health, recommend
 from app.core.logging import configure_logging
+from app.utils.http_client import close_http_clients
 
 configure_logging()
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Rentwise Backend", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    yield
+    await close_http_clients()
+
+
+app = FastAPI(title="Rentwise Backend", version="0.1.0", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
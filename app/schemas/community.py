@@ -31,6 +31,27 @@ class CommunityMetricsResponse(BaseModel):
     poi_demand_density_per_km2: float | None = None
     overall_confidence: float | None = None
     updated_at: datetime | None = None
+    is_stale: bool = False
+
+
+class RentHistoryPoint(BaseModel):
+    month: str
+    rent: float | None = None
+
+
+class RentHistoryResponse(BaseModel):
+    community_id: str
+    city: str
+    state: str
+    latest_month: str | None = None
+    latest_rent: float | None = None
+    rent_trend_3m_pct: float | None = None
+    rent_trend_6m_pct: float | None = None
+    rent_trend_12m_pct: float | None = None
+    rent_trend_24m_pct: float | None = None
+    rent_volatility_12m_pct: float | None = None
+    seasonally_adjusted_rent: float | None = None
+    history: list[RentHistoryPoint]
 
 
 class ReviewResponse(BaseModel):
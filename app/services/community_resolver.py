@@ -2,7 +2,7 @@ from sqlalchemy.orm import Session
 
 from app.db import crud
 from app.db.models import Community
-from app.services.fetchers.geocoding import geocode_community
+from app.services.geocode_service import geocode_cached
 
 
 def resolve_community(
@@ -22,7 +22,7 @@ def resolve_community(
             return row
 
         if allow_external_lookup:
-            geocoded = geocode_community(community_name)
+            geocoded = geocode_cached(db, community_name)
             if geocoded:
                 return crud.create_community(
                     db=db,
@@ -0,0 +1,156 @@
+import time
+from collections.abc import Callable
+from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.core.config import get_settings
+from app.services.fetchers.google_maps import fetch_commute_matrix as fetch_google_matrix
+from app.services.fetchers.openrouteservice import fetch_commute_matrix as fetch_ors_matrix
+from app.utils.disk_cache import DiskCache
+from app.utils.geo import geohash_encode
+
+# Modes whose travel time depends on traffic or timetables get a
+# time-of-day bucket in the cache key; the rest share one entry all day.
+_TIME_SENSITIVE_MODES = {"driving", "transit"}
+
+# ORS has no transit routing.
+_ORS_PROFILES = {
+    "driving": "driving-car",
+    "walking": "foot-walking",
+    "bicycling": "cycling-regular",
+}
+
+_pair_cache: DiskCache | None = None
+
+Point = tuple[float, float]
+MatrixFetcher = Callable[[list[Point], list[Point]], list[list[int | None]]]
+
+
+def commute_minutes(
+    origin: Point, destination: Point, mode: str = "driving"
+) -> tuple[int | None, str | None]:
+    """
+    Returns (minutes, provider) for one pair. Nearby origins and
+    destinations share cached answers through their geohash cells.
+    """
+    minutes, providers = _commute_matrix([origin], [destination], mode)
+    return minutes[0][0], providers[0][0]
+
+
+def commute_minutes_matrix(
+    origins: list[Point], destinations: list[Point], mode: str = "driving"
+) -> list[list[int | None]]:
+    """
+    Commute minutes for every origin x destination pair. Pairs whose cells
+    are cached are served locally; the rest go to the preferred provider as
+    batched matrix requests (one pair per cell), and whatever it could not
+    route goes to the fallback provider.
+    """
+    minutes, _ = _commute_matrix(origins, destinations, mode)
+    return minutes
+
+
+def commute_cache_stats() -> dict[str, int]:
+    cache = _get_pair_cache()
+    return cache.stats() if cache is not None else {"hits": 0, "misses": 0}
+
+
+def _commute_matrix(
+    origins: list[Point], destinations: list[Point], mode: str
+) -> tuple[list[list[int | None]], list[list[str | None]]]:
+    minutes: list[list[int | None]] = [[None] * len(destinations) for _ in origins]
+    providers: list[list[str | None]] = [[None] * len(destinations) for _ in origins]
+    cache = _get_pair_cache()
+    bucket = _time_bucket(mode)
+
+    # Pairs falling into the same origin/destination cells share one answer.
+    pairs_by_key: dict[str, list[tuple[int, int]]] = {}
+    for i, origin in enumerate(origins):
+        for j, destination in enumerate(destinations):
+            key = _pair_key(origin, destination, mode, bucket)
+            pairs_by_key.setdefault(key, []).append((i, j))
+
+    missing: dict[tuple[int, int], str] = {}
+    for key, pairs in pairs_by_key.items():
+        cached = cache.get(key) if cache is not None else None
+        if cached is None:
+            missing[pairs[0]] = key
+            continue
+        for i, j in pairs:
+            minutes[i][j] = cached["minutes"]
+            providers[i][j] = cached["provider"]
+
+    for provider, fetch in _provider_chain(mode):
+        if not missing:
+            break
+        # Only request the rows/columns that still have gaps.
+        rows = sorted({i for i, _ in missing})
+        cols = sorted({j for _, j in missing})
+        block = fetch([origins[i] for i in rows], [destinations[j] for j in cols])
+        for r, i in enumerate(rows):
+            for c, j in enumerate(cols):
+                value = block[r][c]
+                key = missing.get((i, j))
+                if key is None or value is None:
+                    continue
+                del missing[(i, j)]
+                for pi, pj in pairs_by_key[key]:
+                    minutes[pi][pj] = value
+                    providers[pi][pj] = provider
+                if cache is not None:
+                    cache.set(
+                        key,
+                        {"minutes": value, "provider": provider, "fetched_at": time.time()},
+                    )
+    return minutes, providers
+
+
+def _provider_chain(mode: str) -> list[tuple[str, MatrixFetcher]]:
+    google: tuple[str, MatrixFetcher] = (
+        "google_maps",
+        lambda origins, destinations: fetch_google_matrix(origins, destinations, mode=mode),
+    )
+    chain = [google]
+    profile = _ORS_PROFILES.get(mode)
+    if profile is not None:
+        ors: tuple[str, MatrixFetcher] = (
+            "openrouteservice",
+            lambda origins, destinations: fetch_ors_matrix(origins, destinations, profile=profile),
+        )
+        chain = [google, ors] if get_settings().prefer_google_commute else [ors, google]
+    return chain
+
+
+def _pair_key(origin: Point, destination: Point, mode: str, bucket: str) -> str:
+    precision = get_settings().commute_cache_geohash_precision
+    origin_cell = geohash_encode(origin[0], origin[1], precision)
+    destination_cell = geohash_encode(destination[0], destination[1], precision)
+    return f"{mode}:{bucket}:{origin_cell}:{destination_cell}"
+
+
+def _time_bucket(mode: str) -> str:
+    if mode not in _TIME_SENSITIVE_MODES:
+        return "any"
+    settings = get_settings()
+    try:
+        tz = ZoneInfo(settings.commute_cache_timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        tz = None
+    now = datetime.now(tz)
+    bucket_hours = max(1, settings.commute_cache_bucket_hours)
+    weekday = "we" if now.weekday() >= 5 else "wd"
+    return f"{weekday}{now.hour // bucket_hours * bucket_hours:02d}"
+
+
+def _get_pair_cache() -> DiskCache | None:
+    global _pair_cache
+    settings = get_settings()
+    if not settings.commute_cache_enabled:
+        return None
+    if _pair_cache is None:
+        _pair_cache = DiskCache(
+            settings.commute_cache_path,
+            ttl_sec=settings.commute_cache_ttl_hours * 3600.0,
+            max_entries=settings.commute_cache_max_entries,
+        )
+    return _pair_cache
@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+import logging
 import re
+import threading
 import time
 import urllib.parse
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import httpx
+
+from app.core.config import get_settings
+from app.utils.disk_cache import DiskCache
+from app.utils.http_client import http_request
+
+logger = logging.getLogger(__name__)
 
 CRIMEGRADE_BASE_URL = "https://crimegrade.org"
 CRIMEGRADE_TIMEOUT_SEC = 10
-CRIMEGRADE_MIN_REQUEST_INTERVAL_SEC = 1.2
+# Entries outlive their freshness window so they can be revalidated with
+# If-None-Match / If-Modified-Since instead of being downloaded again.
+CRIMEGRADE_CACHE_RETENTION_DAYS = 90
 
 _GRADE_PATTERN = re.compile(
     r"Overall Crime Grade\s*\|\s*(?P<overall>[A-F][+-]?).*?"
@@ -36,26 +48,45 @@ _CITY_BASELINE_VIOLENT_RATE_PER_100K = {
     ("irvine", "ca"): 281.4,
     ("costa-mesa", "ca"): 542.1,
 }
-_LAST_REQUEST_TS = 0.0
+
+_page_cache: DiskCache | None = None
+# One worker, so background prefetch passes never run side by side.
+_PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crimegrade-prefetch")
+_prefetch_lock = threading.Lock()
+_prefetch_pending: set[str] = set()
 
 
 def fetch_crimegrade_violent_rate_per_100k(
     community_name: str | None,
     city: str | None,
     state: str | None = "CA",
+    cache_only: bool = False,
 ) -> tuple[float | None, str]:
+    """
+    Violent crime per 100k from the first candidate CrimeGrade page that has
+    one. Parsed pages are cached per slug. With cache_only the lookup never
+    touches the network: uncached slugs are queued for a background
+    prefetch and the caller falls through to its other sources.
+    """
     if not city or not state:
         return None, "missing:city_or_state"
 
     candidates = _candidate_slugs(community_name, city, state)
+    uncached: list[str] = []
     for slug in candidates:
-        html = _fetch_page(f"{CRIMEGRADE_BASE_URL}/violent-crime-{slug}/")
-        if html is None:
-            continue
-        per_1000 = _extract_violent_rate_per_1000(html)
-        if per_1000 is None:
+        if cache_only:
+            page = _cached_page(slug)
+            if page is None:
+                uncached.append(slug)
+                continue
+        else:
+            page = _get_page(slug)
+        if page is None or page.get("violent_per_1000") is None:
             continue
-        return round(per_1000 * 100.0, 2), f"crimegrade:violent:{slug}"
+        return round(page["violent_per_1000"] * 100.0, 2), f"crimegrade:violent:{slug}"
+
+    if uncached:
+        schedule_crimegrade_prefetch(uncached)
 
     city_baseline = _CITY_BASELINE_VIOLENT_RATE_PER_100K.get(
         (_slugify(city), _slugify(state))
@@ -66,6 +97,132 @@ def fetch_crimegrade_violent_rate_per_100k(
     return None, "missing:crimegrade_page"
 
 
+def prefetch_crimegrade_pages(slugs: Iterable[str], force: bool = False) -> dict[str, int]:
+    """
+    Fetches (or revalidates) every slug in one sequential pass, paced by the
+    "crimegrade" provider guard. Returns counts by outcome.
+    """
+    counts = {"fresh": 0, "found": 0, "not_found": 0, "failed": 0}
+    for slug in _dedupe(list(slugs)):
+        if not force and _is_fresh(_cached_page(slug)):
+            counts["fresh"] += 1
+            continue
+        page = _get_page(slug, force=True)
+        if page is None:
+            counts["failed"] += 1
+        elif page.get("violent_per_1000") is None:
+            counts["not_found"] += 1
+        else:
+            counts["found"] += 1
+    return counts
+
+
+def crimegrade_city_slugs(
+    city: str, state: str, community_names: Iterable[str | None] = ()
+) -> list[str]:
+    """Every candidate slug for the communities of one city, plus the city page."""
+    slugs: list[str] = []
+    for name in community_names:
+        slugs.extend(_candidate_slugs(name, city, state))
+    slugs.extend(_candidate_slugs(None, city, state))
+    return _dedupe(slugs)
+
+
+def schedule_crimegrade_prefetch(slugs: Iterable[str]) -> Future | None:
+    """Queues a background prefetch for slugs not already queued."""
+    with _prefetch_lock:
+        queued = [slug for slug in _dedupe(list(slugs)) if slug not in _prefetch_pending]
+        if not queued:
+            return None
+        _prefetch_pending.update(queued)
+    return _PREFETCH_EXECUTOR.submit(_run_prefetch, queued)
+
+
+def crimegrade_cache_stats() -> dict[str, int]:
+    cache = _get_page_cache()
+    return cache.stats() if cache else {"hits": 0, "misses": 0}
+
+
+def _run_prefetch(slugs: list[str]) -> None:
+    try:
+        counts = prefetch_crimegrade_pages(slugs)
+        logger.info("CrimeGrade prefetch of %d slug(s): %s", len(slugs), counts)
+    except Exception:
+        logger.exception("CrimeGrade prefetch failed")
+    finally:
+        with _prefetch_lock:
+            _prefetch_pending.difference_update(slugs)
+
+
+def _get_page(slug: str, force: bool = False) -> dict | None:
+    """
+    Parsed page for a slug: fresh cache entries are returned as is, stale
+    ones are revalidated with a conditional request. None when the page
+    could not be fetched and nothing is cached.
+    """
+    cache = _get_page_cache()
+    cached = _cached_page(slug)
+    if not force and _is_fresh(cached):
+        return cached
+
+    url = f"{CRIMEGRADE_BASE_URL}/violent-crime-{slug}/"
+    status, html, headers = _fetch_page(url, cached)
+    if status == 304 and cached is not None:
+        page = {**cached, "checked_at": time.time()}
+    elif status == 404:
+        page = _page_entry(None, headers)
+    elif status == 200 and html is not None:
+        page = _page_entry(html, headers)
+    else:
+        # Network trouble: a stale answer beats none.
+        return cached
+
+    if cache is not None:
+        cache.set(slug, page)
+    return page
+
+
+def _cached_page(slug: str) -> dict | None:
+    cache = _get_page_cache()
+    return cache.get(slug) if cache is not None else None
+
+
+def _is_fresh(page: dict | None) -> bool:
+    if page is None:
+        return False
+    settings = get_settings()
+    if page.get("violent_per_1000") is not None:
+        ttl_sec = settings.crimegrade_cache_ttl_days * 86400.0
+    else:
+        ttl_sec = settings.crimegrade_negative_ttl_hours * 3600.0
+    return time.time() - page.get("checked_at", 0.0) <= ttl_sec
+
+
+def _page_entry(html: str | None, headers: httpx.Headers | None) -> dict:
+    return {
+        "violent_per_1000": _extract_violent_rate_per_1000(html) if html else None,
+        "grades": extract_crimegrade_grades(html) if html else None,
+        "found": html is not None,
+        "etag": headers.get("etag") if headers else None,
+        "last_modified": headers.get("last-modified") if headers else None,
+        "checked_at": time.time(),
+    }
+
+
+def _get_page_cache() -> DiskCache | None:
+    global _page_cache
+    settings = get_settings()
+    if not settings.crimegrade_cache_enabled:
+        return None
+    if _page_cache is None:
+        _page_cache = DiskCache(
+            settings.crimegrade_cache_path,
+            ttl_sec=CRIMEGRADE_CACHE_RETENTION_DAYS * 86400.0,
+            max_entries=settings.crimegrade_cache_max_entries,
+        )
+    return _page_cache
+
+
 def _candidate_slugs(
     community_name: str | None, city: str, state: str
 ) -> list[str]:
@@ -83,32 +240,36 @@ def _candidate_slugs(
     return _dedupe(candidates)
 
 
-def _fetch_page(url: str) -> str | None:
-    global _LAST_REQUEST_TS
-    elapsed = time.monotonic() - _LAST_REQUEST_TS
-    if elapsed < CRIMEGRADE_MIN_REQUEST_INTERVAL_SEC:
-        time.sleep(CRIMEGRADE_MIN_REQUEST_INTERVAL_SEC - elapsed)
-
-    req = Request(
-        url,
-        headers={
-            "Accept": "text/html,application/xhtml+xml",
-            "User-Agent": "rentwise/1.0 academic project",
-        },
-        method="GET",
-    )
+def _fetch_page(
+    url: str, cached: dict | None = None
+) -> tuple[int | None, str | None, httpx.Headers | None]:
+    """Returns (status, html, headers); status is None on network errors."""
+    # Pacing and back-off on 429s come from the "crimegrade" provider guard.
+    headers = {
+        "Accept": "text/html,application/xhtml+xml",
+        "User-Agent": "rentwise/1.0 academic project",
+    }
+    if cached is not None and cached.get("found"):
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
     try:
-        with urlopen(req, timeout=CRIMEGRADE_TIMEOUT_SEC) as resp:
-            _LAST_REQUEST_TS = time.monotonic()
-            return resp.read().decode("utf-8", errors="ignore")
-    except HTTPError as exc:
-        _LAST_REQUEST_TS = time.monotonic()
-        if exc.code == 429:
-            time.sleep(CRIMEGRADE_MIN_REQUEST_INTERVAL_SEC * 3.0)
-        return None
-    except (URLError, TimeoutError):
-        _LAST_REQUEST_TS = time.monotonic()
-        return None
+        resp = http_request(
+            "GET",
+            url,
+            headers=headers,
+            timeout=CRIMEGRADE_TIMEOUT_SEC,
+            provider="crimegrade",
+        )
+    except httpx.HTTPStatusError as exc:
+        # 304 and 404 are answers worth caching, not failures.
+        if exc.response.status_code in (304, 404):
+            return exc.response.status_code, None, exc.response.headers
+        return None, None, None
+    except httpx.HTTPError:
+        return None, None, None
+    return resp.status_code, resp.content.decode("utf-8", errors="ignore"), resp.headers
 
 
 def _extract_violent_rate_per_1000(html: str) -> float | None:
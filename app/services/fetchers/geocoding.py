@@ -1,54 +1,61 @@
 from __future__ import annotations
 
-import json
-import urllib.parse
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+import httpx
+
+from app.utils.http_client import http_request
 
 NOMINATIM_SEARCH_URL = "https://nominatim.openstreetmap.org/search"
 
 
-def geocode_community(query: str) -> dict[str, str | float] | None:
+def normalize_geocode_query(query: str) -> str:
     normalized = query.strip()
-    if not normalized:
-        return None
-
     # Bias ambiguous short names to Irvine area for this project.
-    if "," not in normalized and "irvine" not in normalized.lower():
+    if normalized and "," not in normalized and "irvine" not in normalized.lower():
         normalized = f"{normalized}, Irvine, CA"
+    return normalized
 
-    params = urllib.parse.urlencode(
-        {
-            "q": normalized,
-            "format": "jsonv2",
-            "addressdetails": "1",
-            "limit": "1",
-        }
-    )
-    url = f"{NOMINATIM_SEARCH_URL}?{params}"
-    req = Request(
-        url,
-        headers={
-            "Accept": "application/json",
-            "User-Agent": "rentwise-backend/0.1 (community geocoding)",
-        },
-        method="GET",
-    )
+
+def geocode_community_with_status(
+    query: str,
+) -> tuple[dict[str, str | float] | None, bool]:
+    """
+    Returns (result, answered). answered is False when Nominatim could not
+    be reached, so callers can tell "no such place" apart from an outage.
+    """
+    normalized = normalize_geocode_query(query)
+    if not normalized:
+        return None, True
+
+    params = {
+        "q": normalized,
+        "format": "jsonv2",
+        "addressdetails": "1",
+        "limit": "1",
+    }
 
     try:
-        with urlopen(req, timeout=20) as resp:
-            payload = json.loads(resp.read().decode("utf-8"))
-    except (HTTPError, URLError, TimeoutError, json.JSONDecodeError):
-        return None
+        payload = http_request(
+            "GET",
+            NOMINATIM_SEARCH_URL,
+            params=params,
+            headers={
+                "Accept": "application/json",
+                "User-Agent": "rentwise-backend/0.1 (community geocoding)",
+            },
+            timeout=20,
+            provider="nominatim",
+        ).json()
+    except (httpx.HTTPError, ValueError):
+        return None, False
 
     if not payload:
-        return None
+        return None, True
 
     top = payload[0]
     lat = _to_float(top.get("lat"))
     lng = _to_float(top.get("lon"))
     if lat is None or lng is None:
-        return None
+        return None, True
 
     address = top.get("address", {}) or {}
     city = (
@@ -68,7 +75,7 @@ def geocode_community(query: str) -> dict[str, str | float] | None:
         "lng": lng,
         "city": city or None,
         "state": state or None,
-    }
+    }, True
 
 
 def _to_float(value: str | None) -> float | None:
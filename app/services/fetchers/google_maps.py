@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-import json
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+import httpx
 
 from app.core.config import get_settings
+from app.utils.batching import matrix_chunks
+from app.utils.http_client import http_request
 
-GOOGLE_ROUTES_URL = "https://routes.googleapis.com/directions/v2:computeRoutes"
+GOOGLE_ROUTE_MATRIX_URL = "https://routes.googleapis.com/distanceMatrix/v2:computeRouteMatrix"
+# computeRouteMatrix limits: 625 elements per request (100 when traffic-aware
+# or transit) and at most 50 origins + destinations.
+GOOGLE_MATRIX_MAX_ELEMENTS = 625
+GOOGLE_MATRIX_MAX_ELEMENTS_TRAFFIC = 100
+GOOGLE_MATRIX_MAX_WAYPOINTS = 50
 
 _TRAVEL_MODE_MAP = {
     "driving": "DRIVE",
@@ -16,50 +21,74 @@ _TRAVEL_MODE_MAP = {
 }
 
 
-def fetch_commute_minutes(
-    origin: tuple[float, float],
-    destination: tuple[float, float],
+def fetch_commute_matrix(
+    origins: list[tuple[float, float]],
+    destinations: list[tuple[float, float]],
     mode: str = "driving",
-) -> int | None:
-    if origin == destination:
-        return 0
-
+) -> list[list[int | None]]:
+    """
+    Commute minutes for every origin x destination pair via computeRouteMatrix,
+    split into requests at the API's element and waypoint limits. Pairs
+    without a route (or in a failed chunk) are None.
+    """
+    result: list[list[int | None]] = [
+        [0 if origin == destination else None for destination in destinations]
+        for origin in origins
+    ]
     settings = get_settings()
     if not settings.google_maps_api_key:
-        return None
+        return result
 
     travel_mode = _TRAVEL_MODE_MAP.get(mode, "DRIVE")
-    body = {
-        "origin": {"location": {"latLng": {"latitude": origin[0], "longitude": origin[1]}}},
-        "destination": {
-            "location": {"latLng": {"latitude": destination[0], "longitude": destination[1]}}
-        },
-        "travelMode": travel_mode,
-    }
-    if travel_mode == "DRIVE":
-        body["routingPreference"] = "TRAFFIC_AWARE"
-
-    req = Request(
-        GOOGLE_ROUTES_URL,
-        data=json.dumps(body).encode("utf-8"),
-        headers={
-            "Content-Type": "application/json",
-            "X-Goog-Api-Key": settings.google_maps_api_key,
-            "X-Goog-FieldMask": "routes.duration",
-        },
-        method="POST",
+    max_elements = (
+        GOOGLE_MATRIX_MAX_ELEMENTS_TRAFFIC
+        if travel_mode in {"DRIVE", "TRANSIT"}
+        else GOOGLE_MATRIX_MAX_ELEMENTS
     )
+    for rows, cols in matrix_chunks(
+        len(origins), len(destinations), max_elements, GOOGLE_MATRIX_MAX_WAYPOINTS
+    ):
+        body = {
+            "origins": [{"waypoint": _waypoint(origins[i])} for i in rows],
+            "destinations": [{"waypoint": _waypoint(destinations[j])} for j in cols],
+            "travelMode": travel_mode,
+        }
+        if travel_mode == "DRIVE":
+            body["routingPreference"] = "TRAFFIC_AWARE"
+        try:
+            elements = http_request(
+                "POST",
+                GOOGLE_ROUTE_MATRIX_URL,
+                json=body,
+                headers={
+                    "X-Goog-Api-Key": settings.google_maps_api_key,
+                    "X-Goog-FieldMask": "originIndex,destinationIndex,duration,condition",
+                },
+                timeout=20,
+                provider="google_routes",
+            ).json()
+        except (httpx.HTTPError, ValueError):
+            continue
+        if not isinstance(elements, list):
+            continue
 
-    try:
-        with urlopen(req, timeout=10) as resp:
-            payload = json.loads(resp.read().decode("utf-8"))
-    except (HTTPError, URLError, TimeoutError, json.JSONDecodeError):
-        return None
+        for element in elements:
+            if element.get("condition") != "ROUTE_EXISTS":
+                continue
+            # Zero indexes are omitted from the JSON response.
+            row = element.get("originIndex", 0)
+            col = element.get("destinationIndex", 0)
+            if 0 <= row < len(rows) and 0 <= col < len(cols):
+                result[rows[row]][cols[col]] = _duration_minutes(element.get("duration"))
+    return result
 
-    routes = payload.get("routes") or []
-    if not routes:
-        return None
-    duration = routes[0].get("duration")  # e.g. "1200s"
+
+def _waypoint(point: tuple[float, float]) -> dict:
+    return {"location": {"latLng": {"latitude": point[0], "longitude": point[1]}}}
+
+
+def _duration_minutes(duration) -> int | None:
+    # Durations are strings like "1200s".
     if not isinstance(duration, str) or not duration.endswith("s"):
         return None
     try:
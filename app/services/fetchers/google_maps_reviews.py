@@ -1,14 +1,13 @@
 from __future__ import annotations
 
-import json
-import urllib.parse
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+import httpx
 
 from app.core.config import get_settings
+from app.utils.http_client import http_request
 
 PLACES_TEXT_SEARCH_URL = "https://maps.googleapis.com/maps/api/place/textsearch/json"
 PLACE_DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
+PLACES_NEARBY_SEARCH_URL = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
 
 
 def search_places(query: str, max_results: int = 5) -> list[str]:
@@ -20,19 +19,14 @@ def search_places(query: str, max_results: int = 5) -> list[str]:
     if not settings.google_maps_api_key:
         return []
 
-    params = urllib.parse.urlencode(
+    data = _get_json(
+        PLACES_TEXT_SEARCH_URL,
         {
             "query": query,
             "key": settings.google_maps_api_key,
-        }
+        },
     )
-    url = f"{PLACES_TEXT_SEARCH_URL}?{params}"
-    req = Request(url, headers={"Accept": "application/json"}, method="GET")
-
-    try:
-        with urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-    except (HTTPError, URLError, TimeoutError, json.JSONDecodeError):
+    if data is None:
         return []
 
     if data.get("status") not in ("OK", "ZERO_RESULTS"):
@@ -54,22 +48,16 @@ def search_places_nearby(
     if not settings.google_maps_api_key:
         return []
 
-    nearby_url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
-    params = urllib.parse.urlencode(
+    data = _get_json(
+        PLACES_NEARBY_SEARCH_URL,
         {
             "location": f"{lat},{lng}",
             "radius": radius_m,
             "type": place_type,
             "key": settings.google_maps_api_key,
-        }
+        },
     )
-    url = f"{nearby_url}?{params}"
-    req = Request(url, headers={"Accept": "application/json"}, method="GET")
-
-    try:
-        with urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-    except (HTTPError, URLError, TimeoutError, json.JSONDecodeError):
+    if data is None:
         return []
 
     if data.get("status") not in ("OK", "ZERO_RESULTS"):
@@ -90,20 +78,15 @@ def fetch_place_reviews(place_id: str) -> list[dict]:
     if not settings.google_maps_api_key:
         return []
 
-    params = urllib.parse.urlencode(
+    data = _get_json(
+        PLACE_DETAILS_URL,
         {
             "place_id": place_id,
             "fields": "name,reviews",
             "key": settings.google_maps_api_key,
-        }
+        },
     )
-    url = f"{PLACE_DETAILS_URL}?{params}"
-    req = Request(url, headers={"Accept": "application/json"}, method="GET")
-
-    try:
-        with urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-    except (HTTPError, URLError, TimeoutError, json.JSONDecodeError):
+    if data is None:
         return []
 
     if data.get("status") != "OK":
@@ -142,3 +125,17 @@ def _unix_to_iso(ts: int) -> str:
     from datetime import datetime, timezone
 
     return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+def _get_json(url: str, params: dict) -> dict | None:
+    try:
+        return http_request(
+            "GET",
+            url,
+            params=params,
+            headers={"Accept": "application/json"},
+            timeout=10,
+            provider="google_places",
+        ).json()
+    except (httpx.HTTPError, ValueError):
+        return None
@@ -1,13 +1,12 @@
 from __future__ import annotations
 
-import json
-import urllib.parse
 from datetime import datetime, timedelta, timezone
 from math import pi
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+
+import httpx
 
 from app.core.config import get_settings
+from app.utils.http_client import http_request
 
 # Used to convert incident counts to rate/100k for local radius area.
 # If later you add census-based population by tract/zip, replace this estimate.
@@ -78,20 +77,18 @@ def _fetch_incident_count_from_crimeometer(
         "datetime_ini": start_utc.strftime("%Y-%m-%dT%H:%M:%SZ"),
         "datetime_end": now_utc.strftime("%Y-%m-%dT%H:%M:%SZ"),
     }
-    url = f"{base_url}?{urllib.parse.urlencode(params)}"
-    req = Request(
-        url,
-        headers={
-            "Accept": "application/json",
-            "x-api-key": api_key,
-        },
-        method="GET",
-    )
-
     try:
-        with urlopen(req, timeout=max(1, timeout_sec)) as resp:
-            payload = json.loads(resp.read().decode("utf-8"))
-    except (HTTPError, URLError, TimeoutError, json.JSONDecodeError):
+        payload = http_request(
+            "GET",
+            base_url,
+            params=params,
+            headers={
+                "Accept": "application/json",
+                "x-api-key": api_key,
+            },
+            timeout=max(1, timeout_sec),
+        ).json()
+    except (httpx.HTTPError, ValueError):
         return None
 
     return _extract_incident_count(payload)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import csv
+import threading
 from pathlib import Path
+from typing import Iterable
 
 DEFAULT_CRIME_CSV_PATH = "data/crime_city_baseline.csv"
 
@@ -11,6 +13,10 @@ DEFAULT_CRIME_CSV_PATH = "data/crime_city_baseline.csv"
 DENSITY_FLOOR_MULTIPLIER = 0.8
 DENSITY_SLOPE = 0.6
 
+_baselines_lock = threading.Lock()
+_baselines: dict[tuple[str, str], float | None] = {}
+_baselines_key: tuple[str, float] | None = None
+
 
 def fetch_crime_rate_per_100k(
     city: str | None,
@@ -38,21 +44,53 @@ def fetch_crime_rate_per_100k(
     return rate, "local_csv+density"
 
 
+def read_city_baselines(
+    pairs: Iterable[tuple[str, str | None]],
+    csv_path: str = DEFAULT_CRIME_CSV_PATH,
+) -> dict[tuple[str, str | None], float | None]:
+    """
+    Batch lookup of violent-crime-per-100k baselines, keyed by the (city,
+    state) pairs as passed in. A missing state defaults to CA like the
+    single-city lookup.
+    """
+    baselines = _load_city_baselines(csv_path)
+    return {
+        (city, state): baselines.get(_baseline_key(city, state or "CA"))
+        for city, state in pairs
+    }
+
+
 def _read_city_baseline(path: str, city: str, state: str) -> float | None:
+    return _load_city_baselines(path).get(_baseline_key(city, state))
+
+
+def _load_city_baselines(path: str) -> dict[tuple[str, str], float | None]:
+    """Parses the baseline CSV once and again only when the file changes."""
+    global _baselines, _baselines_key
     csv_path = Path(path)
-    if not csv_path.exists():
-        return None
-    target_city = city.strip().lower()
-    target_state = state.strip().upper()
-    with csv_path.open("r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if (row.get("city") or "").strip().lower() != target_city:
-                continue
-            if (row.get("state") or "").strip().upper() != target_state:
-                continue
-            try:
-                return float(row.get("violent_crime_per_100k") or "")
-            except ValueError:
-                return None
-    return None
+    try:
+        key = (str(csv_path.resolve()), csv_path.stat().st_mtime)
+    except OSError:
+        return {}
+
+    with _baselines_lock:
+        if _baselines_key == key:
+            return _baselines
+        baselines: dict[tuple[str, str], float | None] = {}
+        with csv_path.open("r", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                region = _baseline_key(row.get("city") or "", row.get("state") or "")
+                # First row wins, and an unparseable value stays None, as in the old scan.
+                if region in baselines:
+                    continue
+                try:
+                    baselines[region] = float(row.get("violent_crime_per_100k") or "")
+                except ValueError:
+                    baselines[region] = None
+        _baselines = baselines
+        _baselines_key = key
+        return baselines
+
+
+def _baseline_key(city: str, state: str) -> tuple[str, str]:
+    return city.strip().lower(), state.strip().upper()
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import logging
 import math
+import os
+import threading
 from pathlib import Path
+from typing import Sequence
 
 from app.core.config import get_settings
 
@@ -12,25 +16,273 @@ except ImportError:  # pragma: no cover - runtime optional dependency
     np = None
     tifffile = None
 
+logger = logging.getLogger(__name__)
 
-def fetch_viirs_night_activity_index(center_lat: float, center_lng: float) -> float | None:
-    settings = get_settings()
-    return _read_local_viirs_index(
-        center_lat=center_lat,
-        center_lng=center_lng,
-        tif_path=settings.viirs_local_radiance_tif,
-        radius_km=settings.viirs_sample_radius_km,
-    )
+# ~0-80 radiance maps to 0-100 on a log scale.
+RADIANCE_NORMALIZATION_MAX = 80.0
+# Rows per block when building the summed-area table, to bound memory.
+SAT_BUILD_BLOCK_ROWS = 512
+
+_raster_lock = threading.Lock()
+# Resolved path -> (mtime, raster); holds the cropped subset and/or the full tile.
+_rasters: dict[str, tuple[float, ViirsRaster]] = {}
+
+
+class ViirsRaster:
+    """
+    A north-up VIIRS radiance GeoTIFF opened once: the georeference is parsed
+    a single time and the pixels stay memory-mapped, so a lookup only touches
+    the pixels of its own window. With a summed-area table (sat) attached, a
+    window mean costs four reads regardless of radius.
+    """
+
+    def __init__(
+        self,
+        pixels,
+        origin_x: float,
+        origin_y: float,
+        pixel_scale_x: float,
+        pixel_scale_y: float,
+    ):
+        self.pixels = pixels
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.pixel_scale_x = pixel_scale_x
+        self.pixel_scale_y = pixel_scale_y
+        self.height, self.width = pixels.shape
+        # (2, height + 1, width + 1): integral images of valid radiance and valid-pixel counts.
+        self.sat = None
+
+    def sample(self, lat: float, lng: float, radius_km: float) -> float | None:
+        value = self.sample_many([(lat, lng)], radius_km)[0]
+        return None if math.isnan(value) else float(value)
+
+    def sample_many(
+        self,
+        points: Sequence[tuple[float, float]],
+        radius_km: float,
+        require_full_window: bool = False,
+    ):
+        """
+        Mean valid (finite, > 0) radiance in a radius_km box around each
+        (lat, lng), computed for all points in one gather. Returns a float
+        array: NaN where the point is off the tile (or, with
+        require_full_window, where its window is cut off by the edge), 0.0
+        where the window has no valid pixels.
+        """
+        coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        lat = coords[:, 0]
+        lng = coords[:, 1]
+        result = np.full(len(coords), np.nan)
+        if len(coords) == 0:
+            return result
+
+        # Truncate like int() so edge handling matches the per-point lookup.
+        px = np.trunc((lng - self.origin_x) / self.pixel_scale_x).astype(np.int64)
+        py = np.trunc((self.origin_y - lat) / self.pixel_scale_y).astype(np.int64)
+        px_radius, py_radius = self._pixel_radii(lat, radius_km)
+        if require_full_window:
+            inside = (
+                (px - px_radius >= 0)
+                & (py - py_radius >= 0)
+                & (px + px_radius < self.width)
+                & (py + py_radius < self.height)
+            )
+        else:
+            inside = (px >= 0) & (py >= 0) & (px < self.width) & (py < self.height)
+        if not inside.any():
+            return result
+
+        idx = np.nonzero(inside)[0]
+        if self.sat is not None:
+            result[idx] = self._sat_means(px[idx], py[idx], px_radius[idx], py_radius[idx])
+            return result
+
+        max_rx = int(px_radius[idx].max())
+        max_ry = int(py_radius[idx].max())
+        dx = np.arange(-max_rx, max_rx + 1)
+        dy = np.arange(-max_ry, max_ry + 1)
+
+        # (points, rows, cols) index grids; cells outside a point's own
+        # radius or outside the tile are masked rather than clipped.
+        rows = py[idx, None] + dy[None, :]
+        cols = px[idx, None] + dx[None, :]
+        row_ok = (np.abs(dy)[None, :] <= py_radius[idx, None]) & (rows >= 0) & (rows < self.height)
+        col_ok = (np.abs(dx)[None, :] <= px_radius[idx, None]) & (cols >= 0) & (cols < self.width)
+        window = np.asarray(
+            self.pixels[
+                np.clip(rows, 0, self.height - 1)[:, :, None],
+                np.clip(cols, 0, self.width - 1)[:, None, :],
+            ],
+            dtype=np.float64,
+        )
+        valid = row_ok[:, :, None] & col_ok[:, None, :] & np.isfinite(window) & (window > 0)
+        counts = valid.sum(axis=(1, 2))
+        sums = np.where(valid, window, 0.0).sum(axis=(1, 2))
+        result[idx] = np.where(counts > 0, sums / np.maximum(counts, 1), 0.0)
+        return result
+
+    def _sat_means(self, px, py, px_radius, py_radius):
+        # Same clipped box as the gather path, as half-open [y0, y1) x [x0, x1).
+        x0 = np.maximum(0, px - px_radius)
+        x1 = np.minimum(self.width, px + px_radius + 1)
+        y0 = np.maximum(0, py - py_radius)
+        y1 = np.minimum(self.height, py + py_radius + 1)
+        sat = self.sat
+        totals = sat[:, y1, x1] - sat[:, y0, x1] - sat[:, y1, x0] + sat[:, y0, x0]
+        sums, counts = totals[0], np.rint(totals[1])
+        return np.where(counts > 0, sums / np.maximum(counts, 1), 0.0)
 
+    def _pixel_radii(self, lat, radius_km: float):
+        lat_delta = radius_km / 111.0
+        lon_delta = radius_km / (111.0 * np.maximum(0.1, np.cos(np.radians(lat))))
+        px_radius = np.maximum(1, np.ceil(lon_delta / self.pixel_scale_x)).astype(np.int64)
+        py_radius = np.full(
+            len(lat), max(1, int(math.ceil(lat_delta / self.pixel_scale_y))), dtype=np.int64
+        )
+        return px_radius, py_radius
 
-def _read_local_viirs_index(center_lat: float, center_lng: float, tif_path: str, radius_km: float) -> float | None:
+
+def load_viirs_raster(tif_path: str) -> ViirsRaster | None:
+    """Opens each raster once per process and reopens it only when the file changes."""
     if tifffile is None or np is None:
         return None
 
     path = Path(tif_path)
-    if not path.exists():
+    try:
+        resolved = str(path.resolve())
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+
+    with _raster_lock:
+        cached = _rasters.get(resolved)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        raster = _open_raster(path)
+        if raster is None:
+            return None
+        raster.sat = _load_sat(path, raster)
+        _rasters[resolved] = (mtime, raster)
+        logger.info("Opened VIIRS raster %s (%dx%d)", path, raster.width, raster.height)
+        return raster
+
+
+def crop_viirs_raster(
+    src_path: str,
+    dst_path: str,
+    bboxes: Sequence[tuple[float, float, float, float]],
+    pad_km: float,
+    downsample: int = 1,
+) -> Path | None:
+    """
+    Writes the part of src covering the union of (south, west, north, east)
+    boxes, padded by pad_km so edge windows stay complete, as an uncompressed
+    GeoTIFF the app can memory-map. downsample > 1 averages valid pixels in
+    downsample x downsample blocks.
+    """
+    raster = _open_raster(Path(src_path))
+    if raster is None or not bboxes:
+        return None
+
+    south = min(box[0] for box in bboxes)
+    west = min(box[1] for box in bboxes)
+    north = max(box[2] for box in bboxes)
+    east = max(box[3] for box in bboxes)
+    lat_pad = pad_km / 111.0
+    lng_pad = pad_km / (111.0 * max(0.1, math.cos(math.radians(max(abs(south), abs(north))))))
+
+    x0 = max(0, int(math.floor((west - lng_pad - raster.origin_x) / raster.pixel_scale_x)))
+    x1 = min(raster.width, int(math.ceil((east + lng_pad - raster.origin_x) / raster.pixel_scale_x)))
+    y0 = max(0, int(math.floor((raster.origin_y - north - lat_pad) / raster.pixel_scale_y)))
+    y1 = min(raster.height, int(math.ceil((raster.origin_y - south + lat_pad) / raster.pixel_scale_y)))
+    if x0 >= x1 or y0 >= y1:
         return None
 
+    pixels = np.asarray(raster.pixels[y0:y1, x0:x1], dtype=np.float32)
+    factor = max(1, int(downsample))
+    if factor > 1:
+        pixels = _block_mean(pixels, factor)
+
+    dst = Path(dst_path)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    _write_geotiff(
+        dst,
+        pixels,
+        origin_x=raster.origin_x + x0 * raster.pixel_scale_x,
+        origin_y=raster.origin_y - y0 * raster.pixel_scale_y,
+        pixel_scale_x=raster.pixel_scale_x * factor,
+        pixel_scale_y=raster.pixel_scale_y * factor,
+    )
+    logger.info(
+        "Cropped %s (%dx%d) to %s (%dx%d)",
+        src_path,
+        raster.width,
+        raster.height,
+        dst,
+        pixels.shape[1],
+        pixels.shape[0],
+    )
+    return dst
+
+
+def build_viirs_overviews(tif_path: str, factors: Sequence[int]) -> list[Path]:
+    """Writes <tif>.ovr<factor>.tif block-mean overviews, e.g. for city heatmaps."""
+    path = Path(tif_path)
+    raster = _open_raster(path)
+    if raster is None:
+        return []
+    written = []
+    for factor in sorted({int(f) for f in factors if int(f) > 1}):
+        overview = path.with_name(f"{path.stem}.ovr{factor}{path.suffix}")
+        _write_geotiff(
+            overview,
+            _block_mean(np.asarray(raster.pixels, dtype=np.float32), factor),
+            origin_x=raster.origin_x,
+            origin_y=raster.origin_y,
+            pixel_scale_x=raster.pixel_scale_x * factor,
+            pixel_scale_y=raster.pixel_scale_y * factor,
+        )
+        written.append(overview)
+    return written
+
+
+def fetch_viirs_night_activity_index(center_lat: float, center_lng: float) -> float | None:
+    return fetch_viirs_night_activity_indexes([(center_lat, center_lng)])[0]
+
+
+def fetch_viirs_night_activity_indexes(
+    points: Sequence[tuple[float, float]],
+) -> list[float | None]:
+    """
+    Night activity index (0-100) for many (lat, lng) points in one raster
+    pass. Uses the cropped service-area raster when it exists and falls back
+    to the full tile for points whose window does not fit inside the crop.
+    """
+    settings = get_settings()
+    radius_km = settings.viirs_sample_radius_km
+    radiance = np.full(len(points), np.nan) if np is not None else None
+    # The crop's edges are artificial, so a cut-off window there is a miss;
+    # the full tile keeps clipping at its real edges.
+    for tif_path, require_full_window in (
+        (settings.viirs_service_area_tif, True),
+        (settings.viirs_local_radiance_tif, False),
+    ):
+        missing = [] if radiance is None else np.nonzero(np.isnan(radiance))[0]
+        if len(missing) == 0:
+            break
+        raster = load_viirs_raster(tif_path)
+        if raster is None:
+            continue
+        radiance[missing] = raster.sample_many(
+            [points[i] for i in missing], radius_km, require_full_window
+        )
+    if radiance is None:
+        return [None] * len(points)
+    return [None if math.isnan(value) else _normalize_radiance(value) for value in radiance]
+
+
+def _open_raster(path: Path) -> ViirsRaster | None:
     try:
         with tifffile.TiffFile(path) as tif:
             page = tif.pages[0]
@@ -47,37 +299,116 @@ def _read_local_viirs_index(center_lat: float, center_lng: float, tif_path: str,
 
         arr = tifffile.memmap(path)
     except Exception:
+        logger.exception("Could not open VIIRS raster %s", path)
         return None
 
     if arr.ndim != 2:
         return None
+    return ViirsRaster(arr, origin_x, origin_y, pixel_scale_x, pixel_scale_y)
+
+
+def build_viirs_sat(tif_path: str) -> Path | None:
+    """
+    Writes the summed-area table sidecar (<tif>.sat.npy) for a raster, in row
+    blocks so the full tile never has to be resident. Returns its path.
+    """
+    path = Path(tif_path)
+    raster = _open_raster(path)
+    if raster is None:
+        return None
+    sidecar = _sat_path(path)
+    tmp = sidecar.with_name(f".{sidecar.name}.{os.getpid()}.tmp")
+    height, width = raster.height, raster.width
+    sat = np.lib.format.open_memmap(
+        tmp, mode="w+", dtype=np.float64, shape=(2, height + 1, width + 1)
+    )
+    sat[:, 0, :] = 0.0
+    sat[:, :, 0] = 0.0
+    carry = np.zeros((2, width))
+    for row0 in range(0, height, SAT_BUILD_BLOCK_ROWS):
+        block = np.asarray(raster.pixels[row0 : row0 + SAT_BUILD_BLOCK_ROWS], dtype=np.float64)
+        valid = np.isfinite(block) & (block > 0)
+        for layer, values in enumerate((np.where(valid, block, 0.0), valid.astype(np.float64))):
+            integral = np.cumsum(np.cumsum(values, axis=1), axis=0) + carry[layer]
+            sat[layer, row0 + 1 : row0 + 1 + len(block), 1:] = integral
+            carry[layer] = integral[-1]
+    sat.flush()
+    del sat
+    os.replace(tmp, sidecar)
+    logger.info("Wrote VIIRS summed-area table %s", sidecar)
+    return sidecar
 
-    width = arr.shape[1]
-    height = arr.shape[0]
 
-    # Convert geographic coordinate to pixel index (north-up geotiff).
-    px = int((center_lng - origin_x) / pixel_scale_x)
-    py = int((origin_y - center_lat) / pixel_scale_y)
-    if px < 0 or py < 0 or px >= width or py >= height:
+def _load_sat(path: Path, raster: ViirsRaster):
+    settings = get_settings()
+    if not settings.viirs_sat_enabled:
+        return None
+    sidecar = _sat_path(path)
+    try:
+        fresh = sidecar.stat().st_mtime >= path.stat().st_mtime
+    except OSError:
+        fresh = False
+    if not fresh:
+        if raster.height * raster.width > settings.viirs_sat_max_build_pixels:
+            # Full tiles are too big to integrate on the fly; crop them first.
+            return None
+        try:
+            build_viirs_sat(str(path))
+        except (OSError, ValueError):
+            logger.exception("Could not build VIIRS summed-area table for %s", path)
+            return None
+    try:
+        sat = np.load(sidecar, mmap_mode="r")
+    except (OSError, ValueError):
+        logger.exception("Could not load VIIRS summed-area table %s", sidecar)
         return None
+    if sat.shape != (2, raster.height + 1, raster.width + 1):
+        return None
+    return sat
+
+
+def _block_mean(pixels, factor: int):
+    # Mean of valid (finite, > 0) pixels per block; blocks with none become 0.
+    height = pixels.shape[0] // factor * factor
+    width = pixels.shape[1] // factor * factor
+    blocks = pixels[:height, :width].reshape(height // factor, factor, width // factor, factor)
+    valid = np.isfinite(blocks) & (blocks > 0)
+    sums = np.where(valid, blocks, 0.0).sum(axis=(1, 3))
+    counts = valid.sum(axis=(1, 3))
+    return np.where(counts > 0, sums / np.maximum(counts, 1), 0.0).astype(np.float32)
 
-    lat_delta = radius_km / 111.0
-    lon_delta = radius_km / (111.0 * max(0.1, math.cos(math.radians(center_lat))))
-    px_radius = max(1, int(math.ceil(lon_delta / pixel_scale_x)))
-    py_radius = max(1, int(math.ceil(lat_delta / pixel_scale_y)))
-
-    x0 = max(0, px - px_radius)
-    x1 = min(width, px + px_radius + 1)
-    y0 = max(0, py - py_radius)
-    y1 = min(height, py + py_radius + 1)
-    window = arr[y0:y1, x0:x1]
-
-    # Remove invalid values (negative / zero background).
-    valid = window[np.isfinite(window) & (window > 0)]
-    if valid.size == 0:
-        return 0.0
-
-    mean_radiance = float(valid.mean())
-    # Normalize with log scale: ~0-80 radiance maps to 0-100.
-    normalized = min(100.0, max(0.0, (math.log1p(mean_radiance) / math.log1p(80.0)) * 100.0))
+
+def _write_geotiff(
+    path: Path,
+    pixels,
+    origin_x: float,
+    origin_y: float,
+    pixel_scale_x: float,
+    pixel_scale_y: float,
+) -> None:
+    # Only the two tags the reader needs; written uncompressed so it can be memory-mapped.
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tifffile.imwrite(
+        tmp,
+        pixels,
+        extratags=[
+            (33550, "d", 3, (pixel_scale_x, pixel_scale_y, 0.0), False),
+            (33922, "d", 6, (0.0, 0.0, 0.0, origin_x, origin_y, 0.0), False),
+        ],
+    )
+    os.replace(tmp, path)
+
+
+def _sat_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.sat.npy")
+
+
+def _normalize_radiance(mean_radiance: float) -> float:
+    normalized = min(
+        100.0,
+        max(
+            0.0,
+            (math.log1p(mean_radiance) / math.log1p(RADIANCE_NORMALIZATION_MAX)) * 100.0,
+        ),
+    )
     return round(normalized, 2)
@@ -1,58 +1,64 @@
 from __future__ import annotations
 
-import json
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+import httpx
 
 from app.core.config import get_settings
+from app.utils.batching import matrix_chunks
+from app.utils.http_client import http_request
 
-ORS_BASE_URL = "https://api.openrouteservice.org/v2/directions"
+ORS_MATRIX_URL = "https://api.openrouteservice.org/v2/matrix"
+# Public API limit on sources x destinations per matrix request.
+ORS_MATRIX_MAX_ELEMENTS = 3500
 
 
-def fetch_commute_minutes(
-    origin: tuple[float, float],
-    destination: tuple[float, float],
+def fetch_commute_matrix(
+    origins: list[tuple[float, float]],
+    destinations: list[tuple[float, float]],
     profile: str = "driving-car",
-) -> int | None:
-    if origin == destination:
-        return 0
-
+) -> list[list[int | None]]:
+    """
+    Commute minutes for every origin x destination pair via the ORS matrix
+    endpoint, chunked at the element limit. Unroutable pairs are None.
+    """
+    result: list[list[int | None]] = [
+        [0 if origin == destination else None for destination in destinations]
+        for origin in origins
+    ]
     settings = get_settings()
     if not settings.openrouteservice_api_key:
-        return None
+        return result
 
-    url = f"{ORS_BASE_URL}/{profile}"
-    # ORS requires [lng, lat]
-    body = {
-        "coordinates": [
-            [origin[1], origin[0]],
-            [destination[1], destination[0]],
+    for rows, cols in matrix_chunks(len(origins), len(destinations), ORS_MATRIX_MAX_ELEMENTS):
+        # ORS requires [lng, lat]; sources come first in the locations list.
+        locations = [[origins[i][1], origins[i][0]] for i in rows] + [
+            [destinations[j][1], destinations[j][0]] for j in cols
         ]
-    }
-    data = json.dumps(body).encode("utf-8")
-    req = Request(
-        url,
-        data=data,
-        headers={
-            "Authorization": settings.openrouteservice_api_key,
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        },
-        method="POST",
-    )
-
-    try:
-        with urlopen(req, timeout=8) as resp:
-            payload = json.loads(resp.read().decode("utf-8"))
-    except (HTTPError, URLError, TimeoutError, json.JSONDecodeError):
-        return None
+        body = {
+            "locations": locations,
+            "sources": list(range(len(rows))),
+            "destinations": list(range(len(rows), len(rows) + len(cols))),
+            "metrics": ["duration"],
+        }
+        try:
+            payload = http_request(
+                "POST",
+                f"{ORS_MATRIX_URL}/{profile}",
+                json=body,
+                headers={
+                    "Authorization": settings.openrouteservice_api_key,
+                    "Accept": "application/json",
+                },
+                timeout=20,
+                provider="openrouteservice",
+            ).json()
+        except (httpx.HTTPError, ValueError):
+            continue
 
-    features = payload.get("features") or []
-    if not features:
-        return None
-    summary = ((features[0] or {}).get("properties") or {}).get("summary") or {}
-    seconds = summary.get("duration")
-    try:
-        return int(round(float(seconds) / 60.0))
-    except (TypeError, ValueError):
-        return None
+        durations = payload.get("durations") or []
+        for row, row_durations in zip(rows, durations):
+            for col, seconds in zip(cols, row_durations or []):
+                try:
+                    result[row][col] = int(round(float(seconds) / 60.0))
+                except (TypeError, ValueError):
+                    continue
+    return result
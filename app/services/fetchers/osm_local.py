@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+import threading
+from pathlib import Path
+
+from app.utils.geo import haversine_km
+
+logger = logging.getLogger(__name__)
+
+# Grid cell edge in degrees (~1.1km); a 5km noise lookup touches ~100 cells.
+GRID_CELL_DEG = 0.01
+
+# Tag filters shared with the Overpass queries in overpass_osm.py, so the
+# local and remote backends classify features the same way.
+GROCERY_SHOP_PATTERN = "supermarket|grocery|convenience"
+PARKING_DEMAND_AMENITY_PATTERN = (
+    "restaurant|cafe|bar|pub|fast_food|school|college|university|cinema|theatre|"
+    "place_of_worship|clinic|doctors|dentist|hospital"
+)
+NOISE_HIGHWAY_PATTERN = "motorway|trunk|primary"
+
+# Overpass `~` filters are unanchored regex searches; these match the same way.
+GROCERY_SHOP_RE = re.compile(GROCERY_SHOP_PATTERN)
+PARKING_DEMAND_AMENITY_RE = re.compile(PARKING_DEMAND_AMENITY_PATTERN)
+NOISE_HIGHWAY_RE = re.compile(NOISE_HIGHWAY_PATTERN)
+
+_index_lock = threading.Lock()
+_index: OsmLocalIndex | None = None
+_index_key: tuple[str, float] | None = None
+
+
+class OsmLocalIndex:
+    """
+    In-memory grid index over a local OSM extract. Features are stored as
+    Overpass-style elements (nodes with lat/lon, ways/relations with center and
+    geometry) so the Overpass weighting helpers can consume them unchanged.
+    The tag filters mirror the Overpass queries in overpass_osm.py.
+    """
+
+    def __init__(self, elements: list[dict], cell_deg: float = GRID_CELL_DEG):
+        self.cell_deg = cell_deg
+        self.elements = elements
+        self._cells: dict[tuple[int, int], list[int]] = {}
+        for idx, element in enumerate(elements):
+            cells = {self._cell(lat, lng) for lat, lng in _vertices(element)}
+            for cell in cells:
+                self._cells.setdefault(cell, []).append(idx)
+
+    def grocery(self, lat: float, lng: float, radius_km: float) -> list[dict]:
+        return [
+            element
+            for element in self.around(lat, lng, radius_km)
+            if element["type"] in {"node", "way"}
+            and GROCERY_SHOP_RE.search(element["tags"].get("shop") or "")
+        ]
+
+    def parking(self, lat: float, lng: float, radius_km: float) -> list[dict]:
+        return [
+            element
+            for element in self.around(lat, lng, radius_km)
+            if _matches_parking_query(element)
+        ]
+
+    def noise(self, lat: float, lng: float, radius_km: float) -> list[dict]:
+        return [
+            element
+            for element in self.around(lat, lng, radius_km)
+            if element["type"] in {"way", "relation"} and _matches_noise_query(element)
+        ]
+
+    def around(self, lat: float, lng: float, radius_km: float) -> list[dict]:
+        # Same semantics as Overpass `around`: any vertex within the radius.
+        lat_delta = radius_km / 111.0
+        lng_delta = radius_km / (111.0 * max(0.1, math.cos(math.radians(lat))))
+        row0, col0 = self._cell(lat - lat_delta, lng - lng_delta)
+        row1, col1 = self._cell(lat + lat_delta, lng + lng_delta)
+
+        seen: set[int] = set()
+        matches: list[dict] = []
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                for idx in self._cells.get((row, col), ()):
+                    if idx in seen:
+                        continue
+                    seen.add(idx)
+                    element = self.elements[idx]
+                    if any(
+                        haversine_km(lat, lng, v_lat, v_lng) <= radius_km
+                        for v_lat, v_lng in _vertices(element)
+                    ):
+                        matches.append(element)
+        return matches
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lng / self.cell_deg))
+
+
+def load_local_osm_index(path: str) -> OsmLocalIndex | None:
+    """Loads the extract once per process and reloads it when the file changes."""
+    global _index, _index_key
+    extract = Path(path)
+    try:
+        key = (str(extract.resolve()), extract.stat().st_mtime)
+    except OSError:
+        return None
+
+    with _index_lock:
+        if _index is not None and _index_key == key:
+            return _index
+        try:
+            elements = _read_extract(extract)
+        except (OSError, ValueError):
+            logger.exception("Could not load OSM extract %s", extract)
+            return None
+        _index = OsmLocalIndex(elements)
+        _index_key = key
+        logger.info("Loaded %d OSM features from %s", len(elements), extract)
+        return _index
+
+
+def _read_extract(path: Path) -> list[dict]:
+    """
+    Accepts a GeoJSON FeatureCollection or a GeoJSON text sequence (one
+    feature per line, as written by `osmium export -f geojsonseq`). Feature
+    properties are the OSM tags; an optional "@type" marks relations.
+    """
+    with path.open("r", encoding="utf-8") as f:
+        text = f.read()
+
+    stripped = text.lstrip("\x1e \t\r\n")
+    if stripped.startswith("{") and '"FeatureCollection"' in stripped[:200]:
+        features = json.loads(stripped).get("features", [])
+    else:
+        features = [
+            json.loads(line.strip("\x1e \t\r"))
+            for line in text.splitlines()
+            if line.strip("\x1e \t\r")
+        ]
+
+    elements = []
+    for feature in features:
+        element = _feature_to_element(feature)
+        if element is not None:
+            elements.append(element)
+    return elements
+
+
+def _feature_to_element(feature: dict) -> dict | None:
+    geometry = feature.get("geometry") or {}
+    properties = feature.get("properties") or {}
+    tags = {
+        key: str(value)
+        for key, value in properties.items()
+        if not key.startswith("@") and value is not None
+    }
+    points = list(_flatten_coordinates(geometry.get("coordinates")))
+    if not points:
+        return None
+
+    if geometry.get("type") == "Point":
+        lng, lat = points[0]
+        return {"type": "node", "lat": lat, "lon": lng, "tags": tags}
+
+    element_type = "relation" if properties.get("@type") == "relation" else "way"
+    center_lat = sum(lat for _, lat in points) / len(points)
+    center_lng = sum(lng for lng, _ in points) / len(points)
+    return {
+        "type": element_type,
+        "center": {"lat": center_lat, "lon": center_lng},
+        "geometry": [{"lat": lat, "lon": lng} for lng, lat in points],
+        "tags": tags,
+    }
+
+
+def _flatten_coordinates(coordinates):
+    if not isinstance(coordinates, list) or not coordinates:
+        return
+    if isinstance(coordinates[0], (int, float)):
+        if len(coordinates) >= 2:
+            yield float(coordinates[0]), float(coordinates[1])
+        return
+    for item in coordinates:
+        yield from _flatten_coordinates(item)
+
+
+def _vertices(element: dict):
+    if element["type"] == "node":
+        yield element["lat"], element["lon"]
+        return
+    for point in element.get("geometry", []):
+        yield point["lat"], point["lon"]
+
+
+def _matches_parking_query(element: dict) -> bool:
+    tags = element["tags"]
+    element_type = element["type"]
+    amenity = tags.get("amenity") or ""
+    if amenity == "parking":
+        return True
+    if element_type == "relation":
+        return False
+    if amenity == "parking_space":
+        return True
+    if PARKING_DEMAND_AMENITY_RE.search(amenity):
+        return True
+    return "shop" in tags or "office" in tags
+
+
+def _matches_noise_query(element: dict) -> bool:
+    tags = element["tags"]
+    if NOISE_HIGHWAY_RE.search(tags.get("highway") or ""):
+        return True
+    return tags.get("aeroway") == "aerodrome"
+
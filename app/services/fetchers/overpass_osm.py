@@ -1,10 +1,29 @@
 from __future__ import annotations
 
-import json
+import hashlib
 import math
+import re
+import statistics
+import threading
 import time
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import get_settings
+from app.services.fetchers.osm_local import (
+    GROCERY_SHOP_PATTERN,
+    GROCERY_SHOP_RE,
+    NOISE_HIGHWAY_PATTERN,
+    PARKING_DEMAND_AMENITY_PATTERN,
+    OsmLocalIndex,
+    load_local_osm_index,
+)
+from app.utils.disk_cache import DiskCache
+from app.utils.geo import haversine_km
+from app.utils.http_client import http_request
 
 OVERPASS_ENDPOINTS = (
     "https://overpass-api.de/api/interpreter",
@@ -12,8 +31,140 @@ OVERPASS_ENDPOINTS = (
     "https://overpass.kumi.systems/api/interpreter",
 )
 OVERPASS_TIMEOUT_SEC = 8
+# The combined query returns amenities and 5km road geometry in one response.
+OVERPASS_COMBINED_TIMEOUT_SEC = 15
 OVERPASS_RETRY_ROUNDS = 2
 OVERPASS_BACKOFF_BASE_SEC = 0.8
+# Coordinates in cache keys are rounded to ~10m so repeat lookups of the
+# same place share one cached response.
+OVERPASS_CACHE_COORD_DECIMALS = 4
+_FLOAT_PATTERN = re.compile(r"-?\d+\.\d+")
+
+# Weight of the newest sample in the per-endpoint latency/error averages.
+OVERPASS_STATS_ALPHA = 0.3
+
+_response_cache: DiskCache | None = None
+_endpoint_stats_lock = threading.Lock()
+
+
+@dataclass
+class _EndpointStats:
+    ewma_latency_sec: float | None = None
+    error_rate: float = 0.0
+    successes: int = 0
+    failures: int = 0
+
+
+_endpoint_stats: dict[str, _EndpointStats] = {}
+
+
+@dataclass
+class OverpassMetrics:
+    grocery_density_per_km2: float | None
+    noise_avg_db: float | None
+    noise_p90_db: float | None
+    parking_lot_density_per_km2: float | None
+    parking_capacity_per_km2: float | None
+    poi_demand_density_per_km2: float | None
+
+
+def fetch_overpass_metrics(
+    center_lat: float,
+    center_lng: float,
+    grocery_radius_km: float = 1.2,
+    parking_radius_km: float = 1.2,
+    noise_radius_km: float = 5.0,
+) -> OverpassMetrics | None:
+    """
+    Answers grocery, parking and noise in a single Overpass request.
+    Amenities are printed with `out body center` and noise features with
+    `out geom`, then split locally and fed through the same weighting as
+    the single-purpose fetchers below.
+    """
+    local_index = _local_osm_index()
+    if local_index is not None:
+        noise_avg_db, noise_p90_db = _noise_from_elements(
+            local_index.noise(center_lat, center_lng, noise_radius_km),
+            center_lat,
+            center_lng,
+        )
+        parking_lot_density, parking_capacity, poi_demand_density = (
+            _parking_from_elements(
+                local_index.parking(center_lat, center_lng, parking_radius_km),
+                center_lat,
+                center_lng,
+                parking_radius_km,
+            )
+        )
+        return OverpassMetrics(
+            grocery_density_per_km2=_grocery_density_from_elements(
+                local_index.grocery(center_lat, center_lng, grocery_radius_km),
+                center_lat,
+                center_lng,
+                grocery_radius_km,
+            ),
+            noise_avg_db=noise_avg_db,
+            noise_p90_db=noise_p90_db,
+            parking_lot_density_per_km2=parking_lot_density,
+            parking_capacity_per_km2=parking_capacity,
+            poi_demand_density_per_km2=poi_demand_density,
+        )
+
+    amenity_radius_km = max(grocery_radius_km, parking_radius_km)
+    amenity_m = int(amenity_radius_km * 1000)
+    noise_m = int(noise_radius_km * 1000)
+    around_amenity = f"around:{amenity_m},{center_lat},{center_lng}"
+    around_noise = f"around:{noise_m},{center_lat},{center_lng}"
+    query = f"""
+    [out:json][timeout:{OVERPASS_COMBINED_TIMEOUT_SEC}];
+    (
+      {_parking_query_body(around_amenity)}
+    )->.amenities;
+    .amenities out body center;
+    (
+      {_noise_query_body(around_noise)}
+    )->.noise;
+    .noise out geom;
+    """
+    data = _query_overpass(query, timeout_sec=OVERPASS_COMBINED_TIMEOUT_SEC)
+    if data is None:
+        return None
+
+    amenity_elements: list[dict] = []
+    noise_elements: list[dict] = []
+    for element in data.get("elements", []):
+        # `out body center` gives ways/relations a center; `out geom` does not.
+        if element.get("type") == "node" or "center" in element:
+            amenity_elements.append(element)
+        else:
+            noise_elements.append(element)
+
+    grocery_elements = [
+        element
+        for element in _within_radius(
+            amenity_elements, center_lat, center_lng, grocery_radius_km, amenity_radius_km
+        )
+        if _is_grocery_shop(element.get("tags", {}))
+    ]
+    parking_elements = _within_radius(
+        amenity_elements, center_lat, center_lng, parking_radius_km, amenity_radius_km
+    )
+    noise_avg_db, noise_p90_db = _noise_from_elements(
+        noise_elements, center_lat, center_lng
+    )
+    parking_lot_density, parking_capacity, poi_demand_density = (
+        _parking_from_elements(parking_elements, center_lat, center_lng, parking_radius_km)
+    )
+    return OverpassMetrics(
+        grocery_density_per_km2=_grocery_density_from_elements(
+            grocery_elements, center_lat, center_lng, grocery_radius_km
+        ),
+        noise_avg_db=noise_avg_db,
+        noise_p90_db=noise_p90_db,
+        parking_lot_density_per_km2=parking_lot_density,
+        parking_capacity_per_km2=parking_capacity,
+        poi_demand_density_per_km2=poi_demand_density,
+    )
 
 
 def fetch_grocery_density(
@@ -23,25 +174,41 @@ def fetch_grocery_density(
     Returns a weighted grocery accessibility density.
     Weight combines distance decay and a store-size proxy from OSM tags.
     """
+    local_index = _local_osm_index()
+    if local_index is not None:
+        return _grocery_density_from_elements(
+            local_index.grocery(center_lat, center_lng, radius_km),
+            center_lat,
+            center_lng,
+            radius_km,
+        )
+
     radius_m = int(radius_km * 1000)
     query = f"""
     [out:json][timeout:8];
     (
-      node(around:{radius_m},{center_lat},{center_lng})["shop"~"supermarket|grocery|convenience"];
-      way(around:{radius_m},{center_lat},{center_lng})["shop"~"supermarket|grocery|convenience"];
+      node(around:{radius_m},{center_lat},{center_lng})["shop"~"{GROCERY_SHOP_PATTERN}"];
+      way(around:{radius_m},{center_lat},{center_lng})["shop"~"{GROCERY_SHOP_PATTERN}"];
     );
     out body center;
     """
     data = _query_overpass(query)
     if data is None:
         return None
+    return _grocery_density_from_elements(
+        data.get("elements", []), center_lat, center_lng, radius_km
+    )
+
 
+def _grocery_density_from_elements(
+    elements: list[dict], center_lat: float, center_lng: float, radius_km: float
+) -> float | None:
     weighted_sum = 0.0
-    for element in data.get("elements", []):
+    for element in elements:
         lat, lng = _element_lat_lng(element)
         if lat is None or lng is None:
             continue
-        distance_km = _haversine_km(center_lat, center_lng, lat, lng)
+        distance_km = haversine_km(center_lat, center_lng, lat, lng)
         distance_weight = _distance_decay_weight(distance_km, radius_km)
         size_weight = _grocery_size_weight(element.get("tags", {}))
         weighted_sum += distance_weight * size_weight
@@ -61,37 +228,61 @@ def fetch_parking_metrics(
     - mapped parking capacity per km2 when OSM capacity tags exist
     - POI demand density per km2 for places that tend to compete for parking
     """
+    local_index = _local_osm_index()
+    if local_index is not None:
+        return _parking_from_elements(
+            local_index.parking(center_lat, center_lng, radius_km),
+            center_lat,
+            center_lng,
+            radius_km,
+        )
+
     radius_m = int(radius_km * 1000)
+    around = f"around:{radius_m},{center_lat},{center_lng}"
     query = f"""
     [out:json][timeout:8];
     (
-      node(around:{radius_m},{center_lat},{center_lng})["amenity"="parking"];
-      way(around:{radius_m},{center_lat},{center_lng})["amenity"="parking"];
-      relation(around:{radius_m},{center_lat},{center_lng})["amenity"="parking"];
-      node(around:{radius_m},{center_lat},{center_lng})["amenity"="parking_space"];
-      way(around:{radius_m},{center_lat},{center_lng})["amenity"="parking_space"];
-      node(around:{radius_m},{center_lat},{center_lng})["amenity"~"restaurant|cafe|bar|pub|fast_food|school|college|university|cinema|theatre|place_of_worship|clinic|doctors|dentist|hospital"];
-      way(around:{radius_m},{center_lat},{center_lng})["amenity"~"restaurant|cafe|bar|pub|fast_food|school|college|university|cinema|theatre|place_of_worship|clinic|doctors|dentist|hospital"];
-      node(around:{radius_m},{center_lat},{center_lng})["shop"];
-      way(around:{radius_m},{center_lat},{center_lng})["shop"];
-      node(around:{radius_m},{center_lat},{center_lng})["office"];
-      way(around:{radius_m},{center_lat},{center_lng})["office"];
+      {_parking_query_body(around)}
     );
     out body center;
     """
     data = _query_overpass(query)
     if data is None:
         return None, None, None
+    return _parking_from_elements(
+        data.get("elements", []), center_lat, center_lng, radius_km
+    )
+
 
+def _parking_query_body(around: str) -> str:
+    # Parking supply plus every POI type that competes for it. The shop
+    # filter is a superset of the grocery filter, so it also serves grocery.
+    return f"""
+      node({around})["amenity"="parking"];
+      way({around})["amenity"="parking"];
+      relation({around})["amenity"="parking"];
+      node({around})["amenity"="parking_space"];
+      way({around})["amenity"="parking_space"];
+      node({around})["amenity"~"{PARKING_DEMAND_AMENITY_PATTERN}"];
+      way({around})["amenity"~"{PARKING_DEMAND_AMENITY_PATTERN}"];
+      node({around})["shop"];
+      way({around})["shop"];
+      node({around})["office"];
+      way({around})["office"];"""
+
+
+def _parking_from_elements(
+    elements: list[dict], center_lat: float, center_lng: float, radius_km: float
+) -> tuple[float | None, float | None, float | None]:
     parking_weight = 0.0
     capacity_sum = 0.0
     poi_demand_weight = 0.0
-    for element in data.get("elements", []):
+    for element in elements:
         tags = element.get("tags", {})
         lat, lng = _element_lat_lng(element)
         distance_weight = 1.0
         if lat is not None and lng is not None:
-            distance_km = _haversine_km(center_lat, center_lng, lat, lng)
+            distance_km = haversine_km(center_lat, center_lng, lat, lng)
             distance_weight = _distance_decay_weight(distance_km, radius_km)
 
         if tags.get("amenity") in {"parking", "parking_space"}:
@@ -144,30 +335,49 @@ def fetch_parking_metrics(
 def fetch_noise_proxy(
     center_lat: float, center_lng: float, radius_km: float = 5.0
 ) -> tuple[float | None, float | None]:
+    local_index = _local_osm_index()
+    if local_index is not None:
+        return _noise_from_elements(
+            local_index.noise(center_lat, center_lng, radius_km),
+            center_lat,
+            center_lng,
+        )
+
     radius_m = int(radius_km * 1000)
+    around = f"around:{radius_m},{center_lat},{center_lng}"
     query = f"""
     [out:json][timeout:8];
     (
-      way(around:{radius_m},{center_lat},{center_lng})["highway"~"motorway|trunk|primary"];
-      relation(around:{radius_m},{center_lat},{center_lng})["highway"~"motorway|trunk|primary"];
-      way(around:{radius_m},{center_lat},{center_lng})["aeroway"="aerodrome"];
-      relation(around:{radius_m},{center_lat},{center_lng})["aeroway"="aerodrome"];
+      {_noise_query_body(around)}
     );
     out geom;
     """
     data = _query_overpass(query)
     if data is None:
         return None, None
+    return _noise_from_elements(data.get("elements", []), center_lat, center_lng)
+
 
+def _noise_query_body(around: str) -> str:
+    return f"""
+      way({around})["highway"~"{NOISE_HIGHWAY_PATTERN}"];
+      relation({around})["highway"~"{NOISE_HIGHWAY_PATTERN}"];
+      way({around})["aeroway"="aerodrome"];
+      relation({around})["aeroway"="aerodrome"];"""
+
+
+def _noise_from_elements(
+    elements: list[dict], center_lat: float, center_lng: float
+) -> tuple[float | None, float | None]:
     min_km: float | None = None
-    for element in data.get("elements", []):
+    for element in elements:
         geometry = element.get("geometry", [])
         for point in geometry:
             lat = point.get("lat")
             lng = point.get("lon")
             if lat is None or lng is None:
                 continue
-            dist = _haversine_km(center_lat, center_lng, lat, lng)
+            dist = haversine_km(center_lat, center_lng, lat, lng)
             if min_km is None or dist < min_km:
                 min_km = dist
 
@@ -190,26 +400,77 @@ def _distance_to_noise_db(distance_km: float) -> float:
     return 55.0
 
 
-def _query_overpass(query: str) -> dict | None:
+def _local_osm_index() -> OsmLocalIndex | None:
+    # OSM_BACKEND=local answers from the imported extract; if the extract is
+    # missing or unreadable we keep using the public Overpass mirrors.
+    settings = get_settings()
+    if settings.osm_backend != "local":
+        return None
+    return load_local_osm_index(settings.osm_local_extract_path)
+
+
+def overpass_cache_stats() -> dict[str, int]:
+    cache = _get_response_cache()
+    return cache.stats() if cache else {"hits": 0, "misses": 0}
+
+
+def _query_overpass(query: str, timeout_sec: float = OVERPASS_TIMEOUT_SEC) -> dict | None:
+    cache = _get_response_cache()
+    if cache is None:
+        return _query_overpass_network(query, timeout_sec)
+
+    cache_key = _cache_key(query)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    data = _query_overpass_network(query, timeout_sec)
+    # Overpass reports server-side timeouts as a "remark" next to partial data.
+    if data is not None and "remark" not in data:
+        cache.set(cache_key, data)
+    return data
+
+
+def _get_response_cache() -> DiskCache | None:
+    global _response_cache
+    settings = get_settings()
+    if not settings.overpass_cache_enabled:
+        return None
+    if _response_cache is None:
+        _response_cache = DiskCache(
+            settings.overpass_cache_path,
+            ttl_sec=settings.overpass_cache_ttl_hours * 3600.0,
+            max_entries=settings.overpass_cache_max_entries,
+        )
+    return _response_cache
+
+
+def _cache_key(query: str) -> str:
+    normalized = " ".join(query.split())
+    normalized = _FLOAT_PATTERN.sub(
+        lambda match: f"{float(match.group()):.{OVERPASS_CACHE_COORD_DECIMALS}f}",
+        normalized,
+    )
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _query_overpass_network(query: str, timeout_sec: float) -> dict | None:
     data = query.encode("utf-8")
-    # Retry by rotating endpoints first, then use exponential backoff between rounds.
+    settings = get_settings()
+    # Retry across endpoints first, then use exponential backoff between rounds.
     for round_idx in range(OVERPASS_RETRY_ROUNDS):
-        for endpoint in OVERPASS_ENDPOINTS:
-            req = Request(
-                endpoint,
-                data=data,
-                headers={
-                    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-                    "User-Agent": "rentwise/1.0 (https://github.com/rentwise)",
-                },
-                method="POST",
+        endpoints = _ranked_endpoints()
+        if settings.overpass_hedge_enabled:
+            result = _post_hedged(
+                endpoints, data, timeout_sec, settings.overpass_hedge_delay_sec
             )
-            try:
-                with urlopen(req, timeout=OVERPASS_TIMEOUT_SEC) as resp:
-                    body = resp.read().decode("utf-8")
-                    return json.loads(body)
-            except (HTTPError, URLError, TimeoutError, json.JSONDecodeError):
-                continue
+            if result is not None:
+                return result
+        else:
+            for endpoint in endpoints:
+                result = _post_overpass(endpoint, data, timeout_sec)
+                if result is not None:
+                    return result
 
         if round_idx < OVERPASS_RETRY_ROUNDS - 1:
             sleep_sec = OVERPASS_BACKOFF_BASE_SEC * (2**round_idx)
@@ -218,17 +479,157 @@ def _query_overpass(query: str) -> dict | None:
     return None
 
 
-def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    r = 6371.0
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    d_phi = math.radians(lat2 - lat1)
-    d_lambda = math.radians(lon2 - lon1)
-    a = (
-        math.sin(d_phi / 2) ** 2
-        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+def _post_hedged(
+    endpoints: list[str], data: bytes, timeout_sec: float, hedge_delay_sec: float
+) -> dict | None:
+    """
+    Sends to the best-ranked mirror and starts the next one whenever the
+    in-flight requests have not answered within hedge_delay_sec (or all of
+    them failed). The first successful response wins; slower requests are
+    abandoned and only finish in the background to update endpoint stats.
+    """
+    # A pool per call, like run_concurrently: abandoned requests keep only
+    # their own threads busy instead of queueing later calls behind them.
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, len(endpoints)), thread_name_prefix="overpass-hedge"
+    )
+    remaining = list(endpoints)
+    pending: set[Future] = set()
+    try:
+        while remaining or pending:
+            if remaining:
+                pending.add(
+                    executor.submit(_post_overpass, remaining.pop(0), data, timeout_sec)
+                )
+            done, pending = wait(
+                pending,
+                timeout=hedge_delay_sec if remaining else timeout_sec,
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                result = future.result()
+                if result is not None:
+                    return result
+            if not done and not remaining:
+                # Every mirror is in flight and none answered within the timeout.
+                break
+        return None
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _post_overpass(endpoint: str, data: bytes, timeout_sec: float) -> dict | None:
+    started = time.monotonic()
+    try:
+        result = http_request(
+            "POST",
+            endpoint,
+            content=data,
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+                "User-Agent": "rentwise/1.0 (https://github.com/rentwise)",
+            },
+            timeout=timeout_sec,
+            provider=f"overpass:{urlsplit(endpoint).netloc}",
+        ).json()
+    except (httpx.HTTPError, ValueError):
+        _record_endpoint_result(endpoint, time.monotonic() - started, ok=False)
+        return None
+    _record_endpoint_result(endpoint, time.monotonic() - started, ok=True)
+    return result
+
+
+def overpass_endpoint_stats() -> dict[str, dict[str, float | int | None]]:
+    with _endpoint_stats_lock:
+        return {
+            endpoint: {
+                "ewma_latency_sec": (
+                    round(stats.ewma_latency_sec, 3)
+                    if stats.ewma_latency_sec is not None
+                    else None
+                ),
+                "error_rate": round(stats.error_rate, 3),
+                "successes": stats.successes,
+                "failures": stats.failures,
+            }
+            for endpoint, stats in _endpoint_stats.items()
+        }
+
+
+def _ranked_endpoints() -> list[str]:
+    # Lower expected cost first: smoothed latency plus a timeout-sized
+    # penalty per unit of recent error rate. Mirrors without a latency sample
+    # get the median of the measured ones, so an untried mirror neither jumps
+    # ahead of a fast known one nor is starved. On ties measured mirrors go
+    # first, then the configured order.
+    with _endpoint_stats_lock:
+        stats_by_endpoint = dict(_endpoint_stats)
+        measured = [
+            stats.ewma_latency_sec
+            for stats in stats_by_endpoint.values()
+            if stats.ewma_latency_sec is not None
+        ]
+        prior_sec = statistics.median(measured) if measured else 0.0
+        scores = {}
+        unmeasured = set()
+        for endpoint in OVERPASS_ENDPOINTS:
+            stats = stats_by_endpoint.get(endpoint)
+            latency = stats.ewma_latency_sec if stats else None
+            if latency is None:
+                unmeasured.add(endpoint)
+            error_rate = stats.error_rate if stats else 0.0
+            scores[endpoint] = (
+                latency if latency is not None else prior_sec
+            ) + error_rate * OVERPASS_TIMEOUT_SEC
+    return sorted(
+        OVERPASS_ENDPOINTS,
+        key=lambda endpoint: (
+            scores[endpoint],
+            endpoint in unmeasured,
+            OVERPASS_ENDPOINTS.index(endpoint),
+        ),
     )
-    return r * (2 * math.atan2(math.sqrt(a), math.sqrt(1 - a)))
+
+
+def _record_endpoint_result(endpoint: str, latency_sec: float, ok: bool) -> None:
+    with _endpoint_stats_lock:
+        stats = _endpoint_stats.setdefault(endpoint, _EndpointStats())
+        if ok:
+            stats.successes += 1
+            if stats.ewma_latency_sec is None:
+                stats.ewma_latency_sec = latency_sec
+            else:
+                stats.ewma_latency_sec += OVERPASS_STATS_ALPHA * (
+                    latency_sec - stats.ewma_latency_sec
+                )
+        else:
+            stats.failures += 1
+        sample = 0.0 if ok else 1.0
+        stats.error_rate += OVERPASS_STATS_ALPHA * (sample - stats.error_rate)
+
+
+def _within_radius(
+    elements: list[dict],
+    center_lat: float,
+    center_lng: float,
+    radius_km: float,
+    queried_radius_km: float,
+) -> list[dict]:
+    # Elements were fetched for the widest radius; trim to this metric's own.
+    if radius_km >= queried_radius_km:
+        return elements
+    kept = []
+    for element in elements:
+        lat, lng = _element_lat_lng(element)
+        if lat is None or lng is None:
+            continue
+        if haversine_km(center_lat, center_lng, lat, lng) <= radius_km:
+            kept.append(element)
+    return kept
+
+
+def _is_grocery_shop(tags: dict) -> bool:
+    return GROCERY_SHOP_RE.search(tags.get("shop") or "") is not None
 
 
 def _element_lat_lng(element: dict) -> tuple[float | None, float | None]:
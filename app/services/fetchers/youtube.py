@@ -1,23 +1,25 @@
 from __future__ import annotations
 
-import json
-import urllib.parse
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+import httpx
 
 from app.core.config import get_settings
+from app.utils.http_client import http_request
 
+YOUTUBE_TIMEOUT_SEC = 10
+# Data API quota units per call.
+YOUTUBE_SEARCH_QUOTA_COST = 100
+YOUTUBE_COMMENTS_QUOTA_COST = 1
 
-def _extract_google_error_reason(error: HTTPError) -> str | None:
+
+def _extract_google_error_reason(response: httpx.Response) -> str | None:
     try:
-        payload = error.read().decode("utf-8")
-        data = json.loads(payload)
+        data = response.json()
         errors = data.get("error", {}).get("errors", [])
         if errors and isinstance(errors[0], dict):
             reason = errors[0].get("reason")
             if isinstance(reason, str) and reason:
                 return reason
-    except (OSError, ValueError, json.JSONDecodeError):
+    except (AttributeError, ValueError):
         return None
     return None
 
@@ -39,18 +41,20 @@ def search_videos(query: str, max_results: int = 5) -> list[str]:
         "maxResults": max_results,
         "key": settings.youtube_api_key,
     }
-    url = f"{base_url}?{urllib.parse.urlencode(params)}"
 
     try:
-        req = Request(url)
-        with urlopen(req) as response:
-            if response.status != 200:
-                return []
-            data = json.loads(response.read().decode())
-            items = data.get("items", [])
-            video_ids = [item["id"]["videoId"] for item in items if "id" in item and "videoId" in item["id"]]
-            return video_ids
-    except (HTTPError, URLError, OSError):
+        data = http_request(
+            "GET",
+            base_url,
+            params=params,
+            timeout=YOUTUBE_TIMEOUT_SEC,
+            provider="youtube",
+            cost=YOUTUBE_SEARCH_QUOTA_COST,
+        ).json()
+        items = data.get("items", [])
+        video_ids = [item["id"]["videoId"] for item in items if "id" in item and "videoId" in item["id"]]
+        return video_ids
+    except (httpx.HTTPError, ValueError):
         return []
 
 
@@ -82,62 +86,61 @@ def fetch_comments(video_id: str, max_results: int = 20) -> list[dict]:
             if next_page_token:
                 params["pageToken"] = next_page_token
 
-            url = f"{base_url}?{urllib.parse.urlencode(params)}"
-            req = Request(url)
+            data = http_request(
+                "GET",
+                base_url,
+                params=params,
+                timeout=YOUTUBE_TIMEOUT_SEC,
+                provider="youtube",
+                cost=YOUTUBE_COMMENTS_QUOTA_COST,
+            ).json()
+            items = data.get("items", [])
             
-            with urlopen(req) as response:
-                if response.status != 200:
-                    print(f"Error fetching comments: HTTP {response.status}")
-                    break
-                    
-                data = json.loads(response.read().decode())
-                items = data.get("items", [])
+            for item in items:
+                # Top-level comment
+                top_level = item["snippet"]["topLevelComment"]
+                snippet = top_level["snippet"]
                 
-                for item in items:
-                    # Top-level comment
-                    top_level = item["snippet"]["topLevelComment"]
-                    snippet = top_level["snippet"]
-                    
-                    comment_data = {
-                        "id": top_level["id"],
-                        "text": snippet["textDisplay"],
-                        "author": snippet.get("authorDisplayName", "Unknown"),
-                        "like_count": snippet.get("likeCount", 0),
-                        "published_at": snippet.get("publishedAt"),
-                        "parent_id": None, # It's a top-level comment
-                        "video_id": video_id
-                    }
-                    all_comments.append(comment_data)
-                    
-                    # Fetch replies if they exist in the response
-                    if "replies" in item:
-                        for reply in item["replies"]["comments"]:
-                            reply_snippet = reply["snippet"]
-                            reply_data = {
-                                "id": reply["id"],
-                                "text": reply_snippet["textDisplay"],
-                                "author": reply_snippet.get("authorDisplayName", "Unknown"),
-                                "like_count": reply_snippet.get("likeCount", 0),
-                                "published_at": reply_snippet.get("publishedAt"),
-                                "parent_id": top_level["id"], # Link to parent
-                                "video_id": video_id
-                            }
-                            all_comments.append(reply_data)
-                            
-                    if len(all_comments) >= max_results:
-                        break
+                comment_data = {
+                    "id": top_level["id"],
+                    "text": snippet["textDisplay"],
+                    "author": snippet.get("authorDisplayName", "Unknown"),
+                    "like_count": snippet.get("likeCount", 0),
+                    "published_at": snippet.get("publishedAt"),
+                    "parent_id": None, # It's a top-level comment
+                    "video_id": video_id
+                }
+                all_comments.append(comment_data)
                 
-                next_page_token = data.get("nextPageToken")
-                if not next_page_token:
+                # Fetch replies if they exist in the response
+                if "replies" in item:
+                    for reply in item["replies"]["comments"]:
+                        reply_snippet = reply["snippet"]
+                        reply_data = {
+                            "id": reply["id"],
+                            "text": reply_snippet["textDisplay"],
+                            "author": reply_snippet.get("authorDisplayName", "Unknown"),
+                            "like_count": reply_snippet.get("likeCount", 0),
+                            "published_at": reply_snippet.get("publishedAt"),
+                            "parent_id": top_level["id"], # Link to parent
+                            "video_id": video_id
+                        }
+                        all_comments.append(reply_data)
+                        
+                if len(all_comments) >= max_results:
                     break
-                    
+            
+            next_page_token = data.get("nextPageToken")
+            if not next_page_token:
+                break
+                
         return all_comments
             
-    except HTTPError as e:
-        reason = _extract_google_error_reason(e)
+    except httpx.HTTPStatusError as e:
+        reason = _extract_google_error_reason(e.response)
         # Common non-fatal cases for commentThreads:
         # commentsDisabled / forbidden / videoNotFound.
-        if e.code in (403, 404) and reason in {
+        if e.response.status_code in (403, 404) and reason in {
             "commentsDisabled",
             "forbidden",
             "videoNotFound",
@@ -145,9 +148,9 @@ def fetch_comments(video_id: str, max_results: int = 20) -> list[dict]:
             return all_comments
         print(
             f"Failed to fetch comments for video {video_id}: "
-            f"HTTP {e.code}, reason={reason or 'unknown'}"
+            f"HTTP {e.response.status_code}, reason={reason or 'unknown'}"
         )
         return all_comments
-    except (URLError, OSError) as e:
+    except (httpx.HTTPError, ValueError) as e:
         print(f"Failed to fetch comments for video {video_id}: {e}")
         return all_comments
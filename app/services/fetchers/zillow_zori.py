@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import csv
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Sequence
 
+import numpy as np
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_ZORI_PATH = "data/City_zori_uc_sfrcondomfr_sm_month.csv"
+DEFAULT_ZORI_CACHE_DIR = "data/cache/zori"
 DEFAULT_CITY = "Irvine"
 DEFAULT_STATE = "CA"
 
@@ -17,6 +26,185 @@ DEFAULT_COMMUNITY_IDS = (
     "turtle-rock",
 )
 
+TREND_HORIZONS_MONTHS = (3, 6, 12, 24)
+VOLATILITY_WINDOW_MONTHS = 12
+
+_VALUES_FILE = "values.npy"
+_INDEX_FILE = "index.json"
+
+_store_lock = threading.Lock()
+_store: ZoriStore | None = None
+_store_key: tuple[str, float, int] | None = None
+
+
+class ZoriStore:
+    """
+    City-level ZORI series as one (regions x months) float64 matrix, NaN where
+    Zillow has no value, with a (city, state) -> row index. Loaded from the
+    columnar cache (memory-mapped) when it matches the CSV, else parsed once.
+    """
+
+    def __init__(self, dates: list[str], regions: list[tuple[str, str]], values: np.ndarray):
+        self.dates = dates
+        self.regions = regions
+        self.values = values
+        self._rows = {region: row for row, region in enumerate(regions)}
+
+    def __len__(self) -> int:
+        return len(self.regions)
+
+    def row_index(self, city: str, state: str) -> int | None:
+        return self._rows.get(_region_key(city, state))
+
+    def lookup(self, city: str, state: str) -> np.ndarray | None:
+        row = self.row_index(city, state)
+        return None if row is None else self.values[row]
+
+
+@dataclass
+class ZoriTrends:
+    latest_date: str | None
+    latest_rent: float | None
+    trend_pct: dict[int, float | None]
+    volatility_12m_pct: float | None
+    seasonally_adjusted_rent: float | None
+
+
+def load_zori_store(
+    path: str = DEFAULT_ZORI_PATH, cache_dir: str | None = None
+) -> ZoriStore | None:
+    """
+    Returns the store for the CSV, reusing it until the file changes. A
+    matching columnar cache is memory-mapped; otherwise the CSV is parsed and
+    the cache rebuilt for the next process. cache_dir defaults to
+    DEFAULT_ZORI_CACHE_DIR for the default dataset only; other CSVs are just
+    parsed, so reading them never writes into the repo's cache.
+    """
+    global _store, _store_key
+    csv_path = Path(path)
+    try:
+        stat = csv_path.stat()
+        key = (str(csv_path.resolve()), stat.st_mtime, stat.st_size)
+    except OSError:
+        return None
+    if cache_dir is None and key[0] == str(Path(DEFAULT_ZORI_PATH).resolve()):
+        cache_dir = DEFAULT_ZORI_CACHE_DIR
+
+    with _store_lock:
+        if _store is not None and _store_key == key:
+            return _store
+        store = _load_columnar(Path(cache_dir), key) if cache_dir else None
+        if store is None:
+            try:
+                if cache_dir:
+                    store = build_zori_columnar(path, cache_dir)
+                else:
+                    store = _parse_zori_csv(csv_path)
+            except (OSError, csv.Error):
+                logger.exception("Could not load ZORI file %s", csv_path)
+                return None
+        _store = store
+        _store_key = key
+        logger.info("Indexed %d ZORI city series from %s", len(store), csv_path)
+        return store
+
+
+def build_zori_columnar(
+    path: str = DEFAULT_ZORI_PATH, cache_dir: str = DEFAULT_ZORI_CACHE_DIR
+) -> ZoriStore:
+    """Parses the ZORI CSV and writes values.npy + index.json under cache_dir."""
+    csv_path = Path(path)
+    stat = csv_path.stat()
+    store = _parse_zori_csv(csv_path)
+
+    out_dir = Path(cache_dir)
+    try:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        values_tmp = out_dir / f".{_VALUES_FILE}.{os.getpid()}.tmp"
+        index_tmp = out_dir / f".{_INDEX_FILE}.{os.getpid()}.tmp"
+        with values_tmp.open("wb") as f:
+            np.save(f, store.values)
+        index_tmp.write_text(
+            json.dumps(
+                {
+                    "source": str(csv_path.resolve()),
+                    "source_mtime": stat.st_mtime,
+                    "source_size": stat.st_size,
+                    "dates": store.dates,
+                    "regions": [list(region) for region in store.regions],
+                }
+            ),
+            encoding="utf-8",
+        )
+        # Values first: a reader only trusts the matrix once the new index is in place.
+        os.replace(values_tmp, out_dir / _VALUES_FILE)
+        os.replace(index_tmp, out_dir / _INDEX_FILE)
+    except OSError:
+        logger.exception("Could not write ZORI columnar cache to %s", out_dir)
+    return store
+
+
+def compute_zori_trends(
+    store: ZoriStore, regions: Sequence[tuple[str, str]] | None = None
+) -> dict[tuple[str, str], ZoriTrends]:
+    """
+    Computes latest rent, 3/6/12/24-month trends, 12-month volatility (std of
+    month-over-month % changes) and a seasonally adjusted latest rent for the
+    given regions (all when None), vectorized over the selected rows.
+    """
+    if regions is None:
+        keys = list(store.regions)
+        rows = np.arange(len(keys))
+    else:
+        keys = []
+        row_ids = []
+        for city, state in regions:
+            row = store.row_index(city, state)
+            if row is not None:
+                keys.append(_region_key(city, state))
+                row_ids.append(row)
+        rows = np.asarray(row_ids, dtype=np.intp)
+    if len(rows) == 0 or not store.dates:
+        return {}
+
+    values = np.asarray(store.values[rows], dtype=np.float64)
+    n_rows, n_months = values.shape
+    row_range = np.arange(n_rows)
+
+    has_value = ~np.isnan(values)
+    has_any = has_value.any(axis=1)
+    latest_idx = n_months - 1 - np.argmax(has_value[:, ::-1], axis=1)
+    latest = np.where(has_any, values[row_range, latest_idx], np.nan)
+
+    trends: dict[int, np.ndarray] = {}
+    for horizon in TREND_HORIZONS_MONTHS:
+        prev_idx = latest_idx - horizon
+        prev = np.where(prev_idx >= 0, values[row_range, np.clip(prev_idx, 0, None)], np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            trends[horizon] = np.where(prev > 0, (latest / prev - 1.0) * 100.0, np.nan)
+
+    volatility = _volatility_pct(values, latest_idx)
+    seasonal = _seasonal_factors(values, store.dates)
+    month_of_latest = np.array([int(date[5:7]) - 1 for date in store.dates])[latest_idx]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        adjusted = latest / seasonal[row_range, month_of_latest]
+
+    result: dict[tuple[str, str], ZoriTrends] = {}
+    for i, key in enumerate(keys):
+        result[key] = ZoriTrends(
+            latest_date=store.dates[latest_idx[i]] if has_any[i] else None,
+            # Unrounded, as the CSV scan stored it; the rent-history route rounds.
+            latest_rent=None if np.isnan(latest[i]) else float(latest[i]),
+            trend_pct={h: _round_or_none(trends[h][i]) for h in TREND_HORIZONS_MONTHS},
+            volatility_12m_pct=_round_or_none(volatility[i], 3),
+            seasonally_adjusted_rent=_round_or_none(adjusted[i]),
+        )
+    return result
+
+
+def compute_city_trends(store: ZoriStore, city: str, state: str) -> ZoriTrends | None:
+    return compute_zori_trends(store, [(city, state)]).get(_region_key(city, state))
+
 
 def read_zori_rows(
     path: str = DEFAULT_ZORI_PATH,
@@ -24,68 +212,146 @@ def read_zori_rows(
     state: str = DEFAULT_STATE,
     community_ids: Iterable[str] = DEFAULT_COMMUNITY_IDS,
 ) -> list[dict[str, str]]:
-    csv_path = Path(path)
-    if not csv_path.exists():
+    store = load_zori_store(path)
+    if store is None:
         return []
 
-    with csv_path.open("r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        date_columns = [name for name in (reader.fieldnames or []) if _is_date_column(name)]
-        if not date_columns:
-            return []
+    trends = compute_city_trends(store, city, state)
+    if trends is None:
+        return []
 
-        city_row = _find_city_row(reader, city=city, state=state)
-        if not city_row:
-            return []
+    rows: list[dict[str, str]] = []
+    for community_id in community_ids:
+        rows.append(
+            {
+                "community_id": community_id,
+                "median_rent": _to_str(trends.latest_rent),
+                "rent_2b2b": "",
+                "rent_1b1b": "",
+                "avg_sqft": "",
+                "rent_trend_3m_pct": _to_str(trends.trend_pct[3]),
+                "rent_trend_6m_pct": _to_str(trends.trend_pct[6]),
+                "rent_trend_12m_pct": _to_str(trends.trend_pct[12]),
+                "rent_trend_24m_pct": _to_str(trends.trend_pct[24]),
+                "rent_volatility_12m_pct": _to_str(trends.volatility_12m_pct),
+                "rent_seasonally_adjusted": _to_str(trends.seasonally_adjusted_rent),
+            }
+        )
+    return rows
 
-        latest_rent, rent_12m_ago = _extract_latest_and_12m_ago(city_row, date_columns)
-        rent_trend_12m_pct = None
-        if latest_rent is not None and rent_12m_ago is not None and rent_12m_ago > 0:
-            rent_trend_12m_pct = round(((latest_rent / rent_12m_ago) - 1.0) * 100.0, 2)
 
-        rows: list[dict[str, str]] = []
-        for community_id in community_ids:
-            rows.append(
-                {
-                    "community_id": community_id,
-                    "median_rent": _to_str(latest_rent),
-                    "rent_2b2b": "",
-                    "rent_1b1b": "",
-                    "avg_sqft": "",
-                    "rent_trend_12m_pct": _to_str(rent_trend_12m_pct),
-                }
-            )
-        return rows
+def _load_columnar(cache_dir: Path, key: tuple[str, float, int]) -> ZoriStore | None:
+    try:
+        index = json.loads((cache_dir / _INDEX_FILE).read_text(encoding="utf-8"))
+        if (
+            index.get("source") != key[0]
+            or index.get("source_mtime") != key[1]
+            or index.get("source_size") != key[2]
+        ):
+            return None
+        values = np.load(cache_dir / _VALUES_FILE, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    regions = [(city, state) for city, state in index.get("regions", [])]
+    if values.shape != (len(regions), len(index.get("dates", []))):
+        return None
+    if values.dtype != np.float64:
+        # Written by an older float32 build; rebuild at full precision.
+        return None
+    return ZoriStore(index["dates"], regions, values)
 
 
-def _find_city_row(reader: csv.DictReader, city: str, state: str) -> dict[str, str] | None:
-    city_lower = city.strip().lower()
-    state_upper = state.strip().upper()
-    for row in reader:
-        if (row.get("RegionType") or "").strip().lower() != "city":
-            continue
-        if (row.get("RegionName") or "").strip().lower() != city_lower:
-            continue
-        if (row.get("State") or "").strip().upper() != state_upper:
+def _parse_zori_csv(csv_path: Path) -> ZoriStore:
+    regions: list[tuple[str, str]] = []
+    seen: set[tuple[str, str]] = set()
+    series: list[list[float]] = []
+    with csv_path.open("r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        date_idx = [i for i, name in enumerate(header) if _is_date_column(name)]
+        try:
+            type_idx = header.index("RegionType")
+            name_idx = header.index("RegionName")
+            state_idx = header.index("State")
+        except ValueError:
+            return ZoriStore([], [], np.empty((0, 0), dtype=np.float64))
+
+        for row in reader:
+            if len(row) < len(header):
+                continue
+            if row[type_idx].strip().lower() != "city":
+                continue
+            key = _region_key(row[name_idx], row[state_idx])
+            # Zillow lists each city once; keep the first like the old scan did.
+            if key in seen:
+                continue
+            seen.add(key)
+            regions.append(key)
+            series.append([_to_float_or_nan(row[i]) for i in date_idx])
+
+    values = np.array(series, dtype=np.float64).reshape(len(regions), len(date_idx))
+    return ZoriStore([header[i] for i in date_idx], regions, values)
+
+
+def _volatility_pct(values: np.ndarray, latest_idx: np.ndarray) -> np.ndarray:
+    n_rows, n_months = values.shape
+    if n_months < 2:
+        return np.full(n_rows, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        changes = (values[:, 1:] / values[:, :-1] - 1.0) * 100.0
+    # changes[:, j] is the move into month j + 1; take the window ending at latest.
+    offsets = np.arange(VOLATILITY_WINDOW_MONTHS)[::-1]
+    cols = (latest_idx - 1)[:, None] - offsets[None, :]
+    window = np.where(
+        cols >= 0, changes[np.arange(n_rows)[:, None], np.clip(cols, 0, None)], np.nan
+    )
+    # Manual NaN-aware std: np.nanstd warns on all-NaN rows, which are expected here.
+    count = (~np.isnan(window)).sum(axis=1)
+    filled = np.where(np.isnan(window), 0.0, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = filled.sum(axis=1) / count
+        dev = np.where(np.isnan(window), 0.0, window - mean[:, None])
+        std = np.sqrt((dev**2).sum(axis=1) / count)
+    return np.where(count >= VOLATILITY_WINDOW_MONTHS // 2, std, np.nan)
+
+
+def _seasonal_factors(values: np.ndarray, dates: list[str]) -> np.ndarray:
+    """
+    Classical ratio-to-moving-average seasonal index: each month divided by a
+    centred 2x12 moving average, averaged per calendar month and normalised so
+    the twelve factors average to 1. Returns (rows x 12), NaN if a calendar
+    month never has a full window.
+    """
+    n_rows, n_months = values.shape
+    factors = np.full((n_rows, 12), np.nan)
+    if n_months < 13:
+        return factors
+
+    inner = sum(values[:, k : n_months - 12 + k] for k in range(1, 12))
+    centred = (0.5 * values[:, : n_months - 12] + inner + 0.5 * values[:, 12:]) / 12.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = values[:, 6 : n_months - 6] / centred
+
+    calendar_month = np.array([int(date[5:7]) - 1 for date in dates[6 : n_months - 6]])
+    for month in range(12):
+        month_ratios = ratios[:, calendar_month == month]
+        if month_ratios.shape[1] == 0:
             continue
-        return row
-    return None
+        count = (~np.isnan(month_ratios)).sum(axis=1)
+        total = np.where(np.isnan(month_ratios), 0.0, month_ratios).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factors[:, month] = np.where(count > 0, total / count, np.nan)
+    return factors / factors.mean(axis=1, keepdims=True)
 
 
-def _extract_latest_and_12m_ago(row: dict[str, str], date_columns: list[str]) -> tuple[float | None, float | None]:
-    values = [_to_float(row.get(col)) for col in date_columns]
-    latest_idx = None
-    for i in range(len(values) - 1, -1, -1):
-        if values[i] is not None:
-            latest_idx = i
-            break
-    if latest_idx is None:
-        return None, None
+def _region_key(city: str, state: str) -> tuple[str, str]:
+    return city.strip().lower(), state.strip().upper()
 
-    latest = values[latest_idx]
-    prev_idx = latest_idx - 12
-    prev_12m = values[prev_idx] if prev_idx >= 0 else None
-    return latest, prev_12m
+
+def _round_or_none(value: float, digits: int = 2) -> float | None:
+    if np.isnan(value):
+        return None
+    return round(float(value), digits)
 
 
 def _is_date_column(name: str) -> bool:
@@ -105,6 +371,11 @@ def _to_float(value: str | None) -> float | None:
         return None
 
 
+def _to_float_or_nan(value: str) -> float:
+    parsed = _to_float(value)
+    return np.nan if parsed is None else parsed
+
+
 def _to_str(value: float | None) -> str:
     if value is None:
         return ""
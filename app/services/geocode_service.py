@@ -0,0 +1,98 @@
+import json
+import re
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db import crud
+from app.services.fetchers.geocoding import (
+    geocode_community_with_status,
+    normalize_geocode_query,
+)
+from app.utils.single_flight import SingleFlight
+
+_geocode_flight = SingleFlight("geocode")
+
+
+def geocode_cached(db: Session, query: str) -> dict[str, str | float] | None:
+    """
+    Nominatim geocoding backed by the geocode_cache table. Fresh entries,
+    including recent "no match" answers, are served without calling
+    Nominatim; concurrent misses for the same query share one request.
+    """
+    key = geocode_cache_key(query)
+    if not key:
+        return None
+
+    entry = crud.get_geocode_cache_entries(db, [key]).get(key)
+    if entry is not None and entry.expires_at > datetime.utcnow():
+        return json.loads(entry.result_json) if entry.result_json else None
+
+    outcome, _ = _geocode_flight.do(key, lambda: _lookup_and_store(db, key, query))
+    # A leader that raised re-raises in its own thread; its followers get no
+    # outcome and treat the lookup as a miss.
+    if outcome is None:
+        return None
+    result, _ = outcome
+    return result
+
+
+def prewarm_geocodes(
+    db: Session, queries: Iterable[str], refresh: bool = False
+) -> dict[str, int]:
+    """
+    Geocodes every query not already cached (or all of them with refresh).
+    Nominatim's rate limit paces the lookups. Returns counts by outcome.
+    """
+    by_key: dict[str, str] = {}
+    for query in queries:
+        key = geocode_cache_key(query)
+        if key:
+            by_key.setdefault(key, query)
+
+    now = datetime.utcnow()
+    cached = {} if refresh else crud.get_geocode_cache_entries(db, list(by_key))
+    counts = {"cached": 0, "found": 0, "not_found": 0, "failed": 0}
+    for key, query in by_key.items():
+        entry = cached.get(key)
+        if entry is not None and entry.expires_at > now:
+            counts["cached"] += 1
+            continue
+        result, answered = _lookup_and_store(db, key, query)
+        if not answered:
+            counts["failed"] += 1
+        elif result is None:
+            counts["not_found"] += 1
+        else:
+            counts["found"] += 1
+    return counts
+
+
+def geocode_cache_key(query: str) -> str:
+    return re.sub(r"\s+", " ", normalize_geocode_query(query)).lower()
+
+
+def _lookup_and_store(
+    db: Session, key: str, query: str
+) -> tuple[dict[str, str | float] | None, bool]:
+    result, answered = geocode_community_with_status(query)
+    # Outages are not cached; only real answers (match or no match) are.
+    if answered:
+        settings = get_settings()
+        now = datetime.utcnow()
+        ttl = (
+            timedelta(days=settings.geocode_cache_ttl_days)
+            if result is not None
+            else timedelta(hours=settings.geocode_negative_ttl_hours)
+        )
+        crud.upsert_geocode_cache(
+            db,
+            query_key=key,
+            query=normalize_geocode_query(query),
+            result=result,
+            fetched_at=now,
+            expires_at=now + ttl,
+        )
+    return result, answered
@@ -1,31 +1,59 @@
 import hashlib
 import json
+import logging
+import threading
+import time
+from collections.abc import Callable
 from datetime import datetime
+from functools import partial
+from typing import Any
 
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.db import crud
+from app.db.database import SessionLocal
+from app.db.locks import advisory_lock
+from app.services.commute_service import commute_minutes
 from app.services.fetchers.crimegrade import fetch_crimegrade_violent_rate_per_100k
 from app.services.fetchers.irvine_crime import fetch_crime_rate_per_100k_with_source
 from app.services.fetchers.local_crime import fetch_crime_rate_per_100k as fetch_local_crime_rate
-from app.services.fetchers.google_maps import (
-    fetch_commute_minutes as fetch_google_commute_minutes,
-)
 from app.services.fetchers.nasa_viirs import fetch_viirs_night_activity_index
-from app.services.fetchers.openrouteservice import (
-    fetch_commute_minutes as fetch_ors_commute_minutes,
-)
-from app.services.fetchers.overpass_osm import (
-    fetch_grocery_density,
-    fetch_noise_proxy,
-    fetch_parking_metrics,
-)
+from app.services.fetchers.overpass_osm import fetch_overpass_metrics
 from app.services.fetchers.youtube import fetch_comments, search_videos
 from app.services.fetchers.zillow_zori import read_zori_rows
 from app.services.scoring_service import compute_dimension_scores
+from app.utils.concurrency import run_concurrently
+from app.utils.single_flight import SingleFlight
 from app.utils.time import is_expired
 
+logger = logging.getLogger(__name__)
+
+_metrics_refresh_flight = SingleFlight("metrics_refresh")
+
+# community_id -> monotonic time a background refresh was last queued here.
+_background_refresh_queued_at: dict[str, float] = {}
+_background_refresh_lock = threading.Lock()
+
+# Each source has its own TTL (settings.metrics_source_ttl_hours) and refresh
+# timestamp, stored in details_json["source_refreshed_at"]. Every attempt is
+# also stamped in details_json["source_attempted_at"], so a source that keeps
+# coming back empty waits settings.metrics_retry_ttl_hours between tries.
+METRIC_SOURCES = (
+    "rent",
+    "grocery",
+    "night_activity",
+    "noise",
+    "parking",
+    "commute",
+    "crime",
+    "youtube",
+)
+# Sources still refreshed when external fetchers are skipped.
+LOCAL_METRIC_SOURCES = frozenset({"rent"})
+# Answered together by one combined Overpass query.
+OVERPASS_METRIC_SOURCES = frozenset({"grocery", "noise", "parking"})
+
 
 def ensure_metrics_fresh(
     db: Session, community_id: str, ttl_hours: int | None = None
@@ -35,67 +63,221 @@ def ensure_metrics_fresh(
     )
 
 
+def stale_metric_sources(metrics, ttl_hours: int | None = None) -> set[str]:
+    """
+    Returns the metric sources whose data is older than their TTL and that
+    were not already attempted within the retry window. An explicit ttl_hours
+    overrides every per-source TTL (e.g. 0 to force a full refresh).
+    """
+    if metrics is None or metrics.updated_at is None:
+        return set(METRIC_SOURCES)
+
+    settings = get_settings()
+    refreshed_at = _source_refreshed_at(metrics)
+    attempted_at = _source_attempted_at(metrics)
+    stale: set[str] = set()
+    for source in METRIC_SOURCES:
+        effective_ttl = ttl_hours
+        if effective_ttl is None:
+            effective_ttl = settings.metrics_source_ttl_hours.get(
+                source, settings.metrics_ttl_hours
+            )
+        if refreshed_at[source] is not None and not is_expired(
+            refreshed_at[source], effective_ttl
+        ):
+            continue
+        retry_ttl = min(effective_ttl, settings.metrics_retry_ttl_hours)
+        if attempted_at[source] is not None and not is_expired(
+            attempted_at[source], retry_ttl
+        ):
+            continue
+        stale.add(source)
+    return stale
+
+
+def is_metrics_stale(metrics, ttl_hours: int | None = None) -> bool:
+    return bool(stale_metric_sources(metrics, ttl_hours))
+
+
+def claim_background_refresh(community_id: str) -> bool:
+    """
+    Returns True (and records the claim) unless this process already queued a
+    background refresh for the community within the retry window, so repeated
+    reads of a community whose refresh keeps failing do not queue one each.
+    """
+    window_sec = get_settings().metrics_retry_ttl_hours * 3600.0
+    now = time.monotonic()
+    with _background_refresh_lock:
+        queued_at = _background_refresh_queued_at.get(community_id)
+        if queued_at is not None and now - queued_at < window_sec:
+            return False
+        _background_refresh_queued_at[community_id] = now
+    return True
+
+
+def refresh_metrics_in_background(community_id: str) -> None:
+    """
+    Refreshes metrics outside the request that scheduled it, so it opens its
+    own session instead of reusing the (already closed) request session.
+    """
+    db = SessionLocal()
+    try:
+        ensure_metrics_fresh(db, community_id)
+    except Exception:
+        logger.exception("Background metrics refresh failed for %s", community_id)
+    finally:
+        db.close()
+
+
 def ensure_metrics_fresh_with_options(
     db: Session,
     community_id: str,
     ttl_hours: int | None = None,
     skip_external: bool = False,
 ) -> None:
-    settings = get_settings()
-    effective_ttl = ttl_hours if ttl_hours is not None else settings.metrics_ttl_hours
     existing = crud.get_metrics(db, community_id)
-    if (
-        existing
-        and existing.updated_at
-        and not is_expired(existing.updated_at, effective_ttl)
-    ):
+    if not is_metrics_stale(existing, ttl_hours):
         return
 
+    # Concurrent callers for the same community and options share one refresh
+    # in this process; the advisory lock extends that across uvicorn workers.
+    _metrics_refresh_flight.do(
+        f"{community_id}:ttl={ttl_hours}:skip_external={skip_external}",
+        partial(
+            _refresh_metrics_exclusive, db, community_id, ttl_hours, skip_external
+        ),
+    )
+    if existing is not None:
+        # Another caller may have written the row; drop our stale copy.
+        db.expire(existing)
+
+
+def metrics_refresh_stats() -> dict[str, int]:
+    return _metrics_refresh_flight.stats()
+
+
+def _refresh_metrics_exclusive(
+    db: Session,
+    community_id: str,
+    ttl_hours: int | None,
+    skip_external: bool,
+) -> None:
+    settings = get_settings()
+    with advisory_lock(
+        f"metrics:{community_id}", timeout_sec=settings.ingest_deadline_sec + 5.0
+    ) as acquired:
+        if not acquired:
+            # Another worker held the lock past its deadline; serve what we have.
+            return
+        existing = crud.get_metrics(db, community_id)
+        if existing is not None:
+            db.refresh(existing)
+        if not is_metrics_stale(existing, ttl_hours):
+            return
+        _refresh_metrics(db, community_id, existing, ttl_hours, skip_external)
+
+
+def _refresh_metrics(
+    db: Session,
+    community_id: str,
+    existing,
+    ttl_hours: int | None,
+    skip_external: bool,
+) -> None:
+    settings = get_settings()
     community = crud.get_community(db, community_id)
     if community is None:
         return
 
-    # ZORI (local CSV for rent baseline) — look up current community's city.
-    zori_rows = read_zori_rows(
-        city=community.city or "Irvine",
-        state=community.state or "CA",
-        community_ids=[community_id],
-    )
-    match = next(
-        (row for row in zori_rows if row.get("community_id") == community_id), None
-    )
-    grocery_density = None
-    night_activity_index = None
-    night_activity_source = "none"
-    noise_avg_db = None
-    noise_p90_db = None
-    commute_minutes = None
-    parking_lot_density = None
-    parking_capacity = None
-    poi_demand_density = None
-    if (
-        not skip_external
-        and community.center_lat is not None
-        and community.center_lng is not None
-    ):
-        grocery_density = fetch_grocery_density(
-            community.center_lat, community.center_lng, radius_km=1.2
+    # Only sources whose own TTL has lapsed are fetched again; everything
+    # else is carried over from the cached row.
+    due = stale_metric_sources(existing, ttl_hours)
+    if skip_external:
+        due &= LOCAL_METRIC_SOURCES
+    if due & OVERPASS_METRIC_SOURCES:
+        # One Overpass request answers all three, so refresh them together.
+        due |= OVERPASS_METRIC_SOURCES
+    previous_sources = _load_details(existing).get("sources") or {}
+    refreshed_at = _source_refreshed_at(existing)
+    attempted_at = _source_attempted_at(existing)
+
+    match = None
+    if "rent" in due:
+        # ZORI (local CSV for rent baseline) — look up current community's city.
+        zori_rows = read_zori_rows(
+            city=community.city or "Irvine",
+            state=community.state or "CA",
+            community_ids=[community_id],
         )
-        # Night activity metric is sourced ONLY from local VIIRS raster files.
-        night_activity_index = fetch_viirs_night_activity_index(
-            community.center_lat, community.center_lng
+        match = next(
+            (row for row in zori_rows if row.get("community_id") == community_id),
+            None,
         )
-        if night_activity_index is not None:
-            night_activity_source = "local_viirs"
-        noise_avg_db, noise_p90_db = fetch_noise_proxy(
-            community.center_lat, community.center_lng
-        )
-        parking_lot_density, parking_capacity, poi_demand_density = (
-            fetch_parking_metrics(community.center_lat, community.center_lng)
+
+    # Independent providers run in parallel under one deadline; anything that
+    # fails or runs late is treated like a failed fetch and falls back below.
+    deadline = time.monotonic() + settings.ingest_deadline_sec
+    tasks: dict[str, Callable[[], Any]] = {}
+    cached_video_ids: list[str] = []
+    if "youtube" in due:
+        # Reading the IDs loads the deferred YouTube column group, so only
+        # touch it when YouTube is being refreshed.
+        cached_video_ids = _load_video_ids(existing)
+        tasks["youtube"] = partial(
+            _fetch_youtube_payload, community, cached_video_ids, deadline
         )
-        commute_minutes = _fetch_commute_minutes_with_fallback(
-            community.center_lat, community.center_lng
+    if "crime" in due:
+        tasks["crime"] = partial(_fetch_remote_crime_rate, community)
+    if community.center_lat is not None and community.center_lng is not None:
+        lat, lng = community.center_lat, community.center_lng
+        if due & OVERPASS_METRIC_SOURCES:
+            tasks["overpass"] = partial(
+                fetch_overpass_metrics, lat, lng, grocery_radius_km=1.2
+            )
+        if "night_activity" in due:
+            # Night activity metric is sourced ONLY from local VIIRS raster files.
+            tasks["night_activity"] = partial(
+                fetch_viirs_night_activity_index, lat, lng
+            )
+        if "commute" in due:
+            tasks["commute"] = partial(_fetch_commute_minutes_with_fallback, lat, lng)
+    results = run_concurrently(tasks, timeout_sec=deadline - time.monotonic())
+
+    overpass = results.get("overpass")
+    grocery_density = overpass.grocery_density_per_km2 if overpass else None
+    noise_avg_db = overpass.noise_avg_db if overpass else None
+    noise_p90_db = overpass.noise_p90_db if overpass else None
+    parking_lot_density = overpass.parking_lot_density_per_km2 if overpass else None
+    parking_capacity = overpass.parking_capacity_per_km2 if overpass else None
+    poi_demand_density = overpass.poi_demand_density_per_km2 if overpass else None
+    night_activity_index = results.get("night_activity")
+    # Sources whose task finished in time with a usable value get a new
+    # refreshed-at stamp. Every due source gets an attempted-at stamp, so
+    # failed, late or unconfigured ones wait out the retry window.
+    fetched = {
+        source
+        for source, value in (
+            ("rent", match),
+            ("grocery", grocery_density),
+            ("noise", noise_avg_db),
+            ("parking", parking_lot_density),
+            ("night_activity", night_activity_index),
+            ("commute", results.get("commute")),
+            ("youtube", results.get("youtube")),
         )
+        if value is not None
+    }
+    night_activity_source = "none"
+    if night_activity_index is not None:
+        night_activity_source = "local_viirs"
+    elif (
+        "night_activity" not in due
+        and existing
+        and existing.night_activity_index is not None
+    ):
+        night_activity_index = existing.night_activity_index
+        night_activity_source = previous_sources.get("night_activity_source", "cached")
+    commute_minutes = results.get("commute")
 
     # Keep night metric stable: fallback to previous cached value, then 0.0.
     if (
@@ -146,79 +328,27 @@ def ensure_metrics_fresh_with_options(
 
     crime_rate = None
     crime_source = "skipped" if skip_external else "missing"
-    if not skip_external:
-        # Try CrimeGrade public pages first, then Crimeometer if configured,
-        # then local UCR baseline + density-multiplier heuristic.
-        crime_rate, crime_source = fetch_crimegrade_violent_rate_per_100k(
-            community.name,
-            community.city,
-            community.state,
-        )
+    if "crime" in due:
+        # CrimeGrade and Crimeometer ran with the other providers; the local
+        # UCR baseline + density heuristic needs the grocery density first.
+        crime_rate, crime_source = results.get("crime") or (None, "missing:timeout")
         if crime_rate is None:
-            crime_rate, crime_source = fetch_crime_rate_per_100k_with_source(
+            crime_rate, crime_source = fetch_local_crime_rate(
                 community.city,
-                center_lat=community.center_lat,
-                center_lng=community.center_lng,
+                state=community.state,
+                grocery_density_per_km2=grocery_density,
             )
-            if crime_rate is None:
-                crime_rate, crime_source = fetch_local_crime_rate(
-                    community.city,
-                    state=community.state,
-                    grocery_density_per_km2=grocery_density,
-                )
-
-    # YouTube fetching is enabled for testing when YOUTUBE_API_KEY is set.
-    youtube_video_ids = []
-    youtube_comments = []
-
-    # Check if we already have video IDs saved (to avoid search API cost)
-    if existing and existing.youtube_video_ids:
-        try:
-            youtube_video_ids = json.loads(existing.youtube_video_ids)
-        except json.JSONDecodeError:
-            youtube_video_ids = []
-
-    # If no IDs found in DB, try multiple search strategies to find videos WITH comments
-    if not youtube_video_ids:
-        # Strategies to cover different aspects: reviews, lifestyle, vlogs
-        search_templates = [
-            f"{community.name} {community.city or 'Irvine'} apartments review",
-            f"{community.name} {community.city or 'Irvine'} living",
-            f"{community.name} {community.city or 'Irvine'} tour",
-            f"Living in {community.name} {community.city or 'Irvine'}",
-        ]
-
-        # Use a set to avoid duplicate video IDs across different search queries
-        found_ids_set = set()
-
-        for query in search_templates:
-            # Search for videos
-            # We limit main results to 3 per query to avoid hitting quota limits too fast,
-            # but since we run multiple queries, we'll get a good mix.
-            ids = search_videos(query, max_results=3)
-            if ids:
-                found_ids_set.update(ids)
-
-        # Convert back to list
-        youtube_video_ids = list(found_ids_set)
-
-    # Fetch comments for all unique videos found
-    if youtube_video_ids:
-        for vid in youtube_video_ids:
-            # Limit per video to control quota/size
-            comments = fetch_comments(vid, max_results=10)
-            if comments:
-                youtube_comments.extend(comments)
+        if "crime" in results and crime_rate is not None:
+            fetched.add("crime")
+    elif existing is not None and existing.crime_rate_per_100k is not None:
+        crime_rate = existing.crime_rate_per_100k
+        crime_source = previous_sources.get("crime_api_source", "cached")
 
+    now = datetime.utcnow()
     payload: dict = {
-        "updated_at": datetime.utcnow(),
+        "updated_at": now,
         "grocery_density_per_km2": grocery_density,
         "crime_rate_per_100k": crime_rate,
-        # Save list of IDs and aggregated comments as JSON strings
-        "youtube_video_ids": (
-            json.dumps(youtube_video_ids) if youtube_video_ids else None
-        ),
-        "youtube_comments": json.dumps(youtube_comments) if youtube_comments else None,
         "night_activity_index": night_activity_index,
         "noise_avg_db": noise_avg_db,
         "noise_p90_db": noise_p90_db,
@@ -229,6 +359,24 @@ def ensure_metrics_fresh_with_options(
         "overall_confidence": 0.5,
         "details_json": "{}",
     }
+
+    # YouTube fetching is enabled for testing when YOUTUBE_API_KEY is set.
+    # When it was not due (or missed the deadline) the cached blobs are kept.
+    if "youtube" in due:
+        has_youtube_video = bool(cached_video_ids)
+    else:
+        has_youtube_video = bool(previous_sources.get("youtube_video"))
+    if results.get("youtube") is not None:
+        youtube_video_ids, youtube_comments = results["youtube"]
+        has_youtube_video = bool(youtube_video_ids)
+        # Save list of IDs and aggregated comments as JSON strings
+        payload["youtube_video_ids"] = (
+            json.dumps(youtube_video_ids) if youtube_video_ids else None
+        )
+        payload["youtube_comments"] = (
+            json.dumps(youtube_comments) if youtube_comments else None
+        )
+        payload["youtube_comments_hash"] = _content_hash(payload["youtube_comments"])
     if match:
         payload.update(
             {
@@ -248,13 +396,26 @@ def ensure_metrics_fresh_with_options(
         "night_activity_index",
         "noise_avg_db",
     ]
-    available = sum(1 for key in required_keys if payload.get(key) is not None)
+    available = sum(
+        1
+        for key in required_keys
+        if (payload[key] if key in payload else getattr(existing, key, None))
+        is not None
+    )
     payload["overall_confidence"] = round(available / len(required_keys), 2)
 
+    for source in due:
+        attempted_at[source] = now
+        if source in fetched:
+            refreshed_at[source] = now
     payload["details_json"] = json.dumps(
         {
             "sources": {
-                "zori_csv": bool(match),
+                "zori_csv": (
+                    bool(match)
+                    if "rent" in due
+                    else bool(previous_sources.get("zori_csv"))
+                ),
                 "overpass_grocery": grocery_density is not None,
                 "overpass_night_activity": False,
                 "overpass_noise": noise_avg_db is not None,
@@ -263,12 +424,22 @@ def ensure_metrics_fresh_with_options(
                 "crime_api": crime_rate is not None,
                 "crime_api_source": crime_source,
                 "crimegrade": crime_source.startswith("crimegrade:"),
-                "youtube_video": bool(youtube_video_ids),
+                "youtube_video": has_youtube_video,
                 "commute_minutes": commute_minutes,
                 "overpass_parking": parking_lot_density is not None,
                 "viirs_night_activity": night_activity_source == "local_viirs",
                 "night_activity_source": night_activity_source,
-            }
+            },
+            "source_refreshed_at": {
+                source: value.isoformat()
+                for source, value in refreshed_at.items()
+                if value is not None
+            },
+            "source_attempted_at": {
+                source: value.isoformat()
+                for source, value in attempted_at.items()
+                if value is not None
+            },
         },
         ensure_ascii=True,
     )
@@ -288,45 +459,68 @@ def ensure_metrics_fresh_with_options(
         "review_signal_score": None,
     }
     scores = compute_dimension_scores(score_input)
-    for dimension, value in scores.items():
-        crud.upsert_dimension_score(
-            db=db,
-            community_id=community_id,
-            dimension=dimension,
-            score_0_100=value,
-            summary=f"{dimension} score auto-generated by ingest pipeline",
-            details=score_input,
-            data_origin="api",
-        )
+    crud.upsert_dimension_scores(
+        db,
+        [
+            {
+                "community_id": community_id,
+                "dimension": dimension,
+                "score_0_100": value,
+                "summary": f"{dimension} score auto-generated by ingest pipeline",
+                "details": score_input,
+                "data_origin": "api",
+            }
+            for dimension, value in scores.items()
+        ],
+    )
 
 
 def ensure_reviews_fresh(db: Session, community_id: str) -> None:
     """
     Ensures that the ReviewPost table is populated from the aggregated
     comments stored in CommunityMetrics (fetched during ingestion).
+    Incremental: when the comment blob's hash matches the one last
+    materialized this is a single small SELECT; when it changed, only
+    comment IDs not yet in review_post are written.
     """
-    # Get metrics to find the raw cached comments. We still run this when
-    # review_post rows already exist so older rows can be backfilled with URLs.
-    metrics = crud.get_metrics(db, community_id)
-    if not metrics or not metrics.youtube_comments:
-        # If no metrics or no comments cached, we can't do much.
-        # The main ingestion pipeline (ensure_metrics_fresh) is responsible for fetching.
-        # We could trigger it here, but typically /communities/{id} is called before /reviews
+    watermark = crud.get_review_watermark(db, community_id)
+    if watermark is None:
+        # No metrics yet. The main ingestion pipeline (ensure_metrics_fresh) is
+        # responsible for fetching; /communities/{id} is typically called first.
+        return
+    comments_hash, materialized_hash = watermark
+    if comments_hash is not None and comments_hash == materialized_hash:
         return
 
+    youtube_comments = crud.get_youtube_comments(db, community_id)
+    if not youtube_comments:
+        return
+    if comments_hash is None:
+        # Rows written before the hash column existed.
+        comments_hash = _content_hash(youtube_comments)
+
     # Parse cached comments and insert/update ReviewPost rows.
     try:
-        raw_comments = json.loads(metrics.youtube_comments)
+        raw_comments = json.loads(youtube_comments)
     except json.JSONDecodeError:
         return
 
     if not raw_comments:
         return
 
+    # The first materialization touches every comment so older rows get
+    # backfilled with URLs; later ones only add comments not seen before.
+    known_ids = (
+        crud.get_review_external_ids(db, community_id, "youtube")
+        if materialized_hash is not None
+        else set()
+    )
     review_dicts = []
     for item in raw_comments:
         if isinstance(item, dict):
             # New structured format
+            if item.get("id") in known_ids:
+                continue
             video_id = item.get("video_id")
             review_dicts.append({
                 "id": item.get("id"),
@@ -340,6 +534,8 @@ def ensure_reviews_fresh(db: Session, community_id: str) -> None:
         else:
             # Fallback for old simple string format
             text_hash = hashlib.md5(item.encode("utf-8")).hexdigest()
+            if f"yt-{text_hash}" in known_ids:
+                continue
             review_dicts.append(
                 {
                     "id": f"yt-{text_hash}",
@@ -350,6 +546,13 @@ def ensure_reviews_fresh(db: Session, community_id: str) -> None:
             )
 
     crud.upsert_review_posts(db, community_id, "youtube", review_dicts)
+    crud.set_review_watermark(db, community_id, comments_hash)
+
+
+def _content_hash(text: str | None) -> str | None:
+    if text is None:
+        return None
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
 def _youtube_comment_url(video_id, comment_id) -> str | None:
@@ -369,19 +572,135 @@ def _to_float(value: str | None) -> float | None:
         return None
 
 
+def _fetch_remote_crime_rate(community) -> tuple[float | None, str]:
+    # Try CrimeGrade public pages first, then Crimeometer if configured.
+    crime_rate, crime_source = fetch_crimegrade_violent_rate_per_100k(
+        community.name,
+        community.city,
+        community.state,
+    )
+    if crime_rate is not None:
+        return crime_rate, crime_source
+    return fetch_crime_rate_per_100k_with_source(
+        community.city,
+        center_lat=community.center_lat,
+        center_lng=community.center_lng,
+    )
+
+
+def _load_video_ids(existing) -> list[str]:
+    # Reuse saved video IDs to avoid search API cost.
+    if not existing or not existing.youtube_video_ids:
+        return []
+    try:
+        return json.loads(existing.youtube_video_ids)
+    except json.JSONDecodeError:
+        return []
+
+
+def _load_details(existing) -> dict:
+    if not existing or not existing.details_json:
+        return {}
+    try:
+        details = json.loads(existing.details_json)
+    except (TypeError, json.JSONDecodeError):
+        return {}
+    return details if isinstance(details, dict) else {}
+
+
+def _source_refreshed_at(existing) -> dict[str, datetime | None]:
+    if existing is None:
+        return {source: None for source in METRIC_SOURCES}
+    stored = _load_details(existing).get("source_refreshed_at")
+    if not isinstance(stored, dict):
+        # Rows written before per-source tracking: every source is as old
+        # as the row itself.
+        return {source: existing.updated_at for source in METRIC_SOURCES}
+    return _parse_source_timestamps(stored)
+
+
+def _source_attempted_at(existing) -> dict[str, datetime | None]:
+    stored = _load_details(existing).get("source_attempted_at")
+    if not isinstance(stored, dict):
+        # Rows written before attempts were tracked: the last attempt is the
+        # last successful refresh.
+        return _source_refreshed_at(existing)
+    return _parse_source_timestamps(stored)
+
+
+def _parse_source_timestamps(stored: dict) -> dict[str, datetime | None]:
+    timestamps: dict[str, datetime | None] = {}
+    for source in METRIC_SOURCES:
+        try:
+            timestamps[source] = datetime.fromisoformat(stored[source])
+        except (KeyError, TypeError, ValueError):
+            timestamps[source] = None
+    return timestamps
+
+
+def _fetch_youtube_payload(
+    community, cached_video_ids: list[str], deadline: float
+) -> tuple[list[str], list[dict]] | None:
+    """
+    Returns (video_ids, comments), or None when any search or comment fetch
+    failed or missed the deadline, so the caller keeps the cached blobs
+    instead of storing a partial set.
+    """
+    youtube_video_ids = list(cached_video_ids)
+
+    # If no IDs found in DB, try multiple search strategies to find videos WITH comments
+    if not youtube_video_ids:
+        city = community.city or "Irvine"
+        # Strategies to cover different aspects: reviews, lifestyle, vlogs
+        search_templates = [
+            f"{community.name} {city} apartments review",
+            f"{community.name} {city} living",
+            f"{community.name} {city} tour",
+            f"Living in {community.name} {city}",
+        ]
+        # We limit main results to 3 per query to avoid hitting quota limits too fast,
+        # but since we run multiple queries, we'll get a good mix.
+        search_results = run_concurrently(
+            {
+                query: partial(search_videos, query, max_results=3)
+                for query in search_templates
+            },
+            timeout_sec=deadline - time.monotonic(),
+        )
+        if len(search_results) < len(search_templates):
+            return None
+        # Use a set to avoid duplicate video IDs across different search queries
+        found_ids_set = set()
+        for ids in search_results.values():
+            if ids:
+                found_ids_set.update(ids)
+        youtube_video_ids = list(found_ids_set)
+
+    # Fetch comments for all unique videos found
+    youtube_comments: list[dict] = []
+    if youtube_video_ids:
+        comment_results = run_concurrently(
+            {
+                # Limit per video to control quota/size
+                vid: partial(fetch_comments, vid, max_results=10)
+                for vid in youtube_video_ids
+            },
+            timeout_sec=deadline - time.monotonic(),
+        )
+        if len(comment_results) < len(set(youtube_video_ids)):
+            return None
+        for vid in youtube_video_ids:
+            youtube_comments.extend(comment_results.get(vid) or [])
+
+    return youtube_video_ids, youtube_comments
+
+
 def _fetch_commute_minutes_with_fallback(
     origin_lat: float, origin_lng: float
 ) -> int | None:
+    # Provider order follows prefer_google_commute; answers are cached per geohash cell.
     settings = get_settings()
     origin = (origin_lat, origin_lng)
     destination = (settings.commute_destination_lat, settings.commute_destination_lng)
-    if settings.prefer_google_commute:
-        minutes = fetch_google_commute_minutes(origin, destination)
-        if minutes is not None:
-            return minutes
-        return fetch_ors_commute_minutes(origin, destination)
-
-    minutes = fetch_ors_commute_minutes(origin, destination)
-    if minutes is not None:
-        return minutes
-    return fetch_google_commute_minutes(origin, destination)
+    minutes, _ = commute_minutes(origin, destination)
+    return minutes
@@ -4,16 +4,11 @@ import asyncio
 from dataclasses import dataclass, field
 
 from app.core.config import Settings
+from app.services.commute_service import commute_minutes
 from app.services.fetchers.crimegrade import fetch_crimegrade_violent_rate_per_100k
-from app.services.fetchers.google_maps import (
-    fetch_commute_minutes as fetch_google_commute_minutes,
-)
 from app.services.fetchers.irvine_crime import fetch_crime_rate_per_100k_with_source
 from app.services.fetchers.local_crime import fetch_crime_rate_per_100k as fetch_local_crime_rate
 from app.services.fetchers.nasa_viirs import fetch_viirs_night_activity_index
-from app.services.fetchers.openrouteservice import (
-    fetch_commute_minutes as fetch_ors_commute_minutes,
-)
 from app.services.fetchers.overpass_osm import (
     fetch_grocery_density,
     fetch_noise_proxy,
@@ -39,7 +34,10 @@ def fetch_safety_dimension(
     center_lat: float | None,
     center_lng: float | None,
 ) -> DimensionToolResult:
-    crime_rate, source = fetch_crimegrade_violent_rate_per_100k(name, city, state)
+    # Request path: CrimeGrade is a cache read; misses are prefetched in the background.
+    crime_rate, source = fetch_crimegrade_violent_rate_per_100k(
+        name, city, state, cache_only=True
+    )
     if crime_rate is None:
         crime_rate, source = fetch_crime_rate_per_100k_with_source(
             city,
@@ -88,11 +86,8 @@ def fetch_transit_dimension(
     first_source = "google_maps" if settings.prefer_google_commute else "openrouteservice"
     second_source = "openrouteservice" if settings.prefer_google_commute else "google_maps"
 
-    minutes = _fetch_commute_by_source(first_source, origin, destination)
-    source = first_source
-    if minutes is None:
-        minutes = _fetch_commute_by_source(second_source, origin, destination)
-        source = second_source
+    # Checks the shared commute cache before either provider.
+    minutes, source = commute_minutes(origin, destination)
 
     if minutes is None:
         return DimensionToolResult(
@@ -345,14 +340,3 @@ async def fetch_selected_dimension_tools_async(
         return []
     return list(await asyncio.gather(*tasks))
 
-
-def _fetch_commute_by_source(
-    source: str,
-    origin: tuple[float, float],
-    destination: tuple[float, float],
-) -> int | None:
-    if source == "google_maps":
-        return fetch_google_commute_minutes(origin, destination)
-    if source == "openrouteservice":
-        return fetch_ors_commute_minutes(origin, destination)
-    return None
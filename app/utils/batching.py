@@ -0,0 +1,38 @@
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Yields lists of up to size items; generators are consumed lazily."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, max(1, size))):
+        yield chunk
+
+
+def matrix_chunks(
+    n_rows: int,
+    n_cols: int,
+    max_elements: int,
+    max_items: int | None = None,
+) -> Iterator[tuple[range, range]]:
+    """
+    Splits an n_rows x n_cols matrix request into blocks that respect a
+    provider's element limit (rows * cols) and, optionally, its limit on
+    rows + cols. Column blocks are kept as wide as allowed since commute
+    matrices usually have many origins and few destinations.
+    """
+    if n_rows <= 0 or n_cols <= 0:
+        return
+    col_size = min(n_cols, max_elements)
+    if max_items is not None:
+        col_size = min(col_size, max_items - 1)
+    row_size = max_elements // col_size
+    if max_items is not None:
+        row_size = min(row_size, max_items - col_size)
+    row_size = max(1, min(n_rows, row_size))
+    for col0 in range(0, n_cols, col_size):
+        for row0 in range(0, n_rows, row_size):
+            yield range(row0, min(n_rows, row0 + row_size)), range(col0, min(n_cols, col0 + col_size))
@@ -0,0 +1,44 @@
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def run_concurrently(
+    tasks: dict[str, Callable[[], T]],
+    timeout_sec: float,
+    max_workers: int | None = None,
+) -> dict[str, T]:
+    """
+    Runs blocking callables on worker threads and waits at most timeout_sec
+    for all of them. Tasks that raise or miss the deadline are left out of
+    the result so callers can fall back to cached values.
+    """
+    if not tasks:
+        return {}
+
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers or len(tasks),
+        thread_name_prefix="rentwise-fanout",
+    )
+    futures = {name: executor.submit(task) for name, task in tasks.items()}
+    try:
+        wait(futures.values(), timeout=max(0.0, timeout_sec))
+    finally:
+        # Do not block on stragglers; their results are discarded.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    results: dict[str, T] = {}
+    for name, future in futures.items():
+        if future.cancelled() or not future.done():
+            logger.warning("Task %s missed the %.1fs deadline", name, timeout_sec)
+            continue
+        try:
+            results[name] = future.result()
+        except Exception:
+            logger.exception("Task %s failed", name)
+    return results
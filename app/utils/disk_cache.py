@@ -0,0 +1,119 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    Small persistent JSON cache in a local SQLite file. Values are stored
+    zlib-compressed, expire after ttl_sec, and the least recently used
+    entries are evicted once the cache holds more than max_entries.
+    Safe to share between threads and worker processes.
+    """
+
+    def __init__(self, path: str, ttl_sec: float, max_entries: int):
+        self.path = Path(path)
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._ready = False
+
+    def get(self, key: str) -> Any | None:
+        now = time.time()
+        row = None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value, stored_at FROM cache_entry WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] <= self.ttl_sec:
+                    conn.execute(
+                        "UPDATE cache_entry SET accessed_at = ?, hit_count = hit_count + 1 "
+                        "WHERE key = ?",
+                        (now, key),
+                    )
+                else:
+                    row = None
+        except (sqlite3.Error, OSError):
+            logger.exception("Cache read failed for %s", self.path)
+            row = None
+
+        if row is None:
+            self._count(hit=False)
+            return None
+        try:
+            value = json.loads(zlib.decompress(row[0]).decode("utf-8"))
+        except (zlib.error, ValueError):
+            self._count(hit=False)
+            return None
+        self._count(hit=True)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        blob = zlib.compress(json.dumps(value, ensure_ascii=True).encode("utf-8"))
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entry "
+                    "(key, value, stored_at, accessed_at, hit_count) VALUES (?, ?, ?, ?, 0)",
+                    (key, blob, now, now),
+                )
+                conn.execute(
+                    "DELETE FROM cache_entry WHERE stored_at < ?", (now - self.ttl_sec,)
+                )
+                conn.execute(
+                    "DELETE FROM cache_entry WHERE key IN ("
+                    "SELECT key FROM cache_entry ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+        except (sqlite3.Error, OSError):
+            logger.exception("Cache write failed for %s", self.path)
+
+    def stats(self) -> dict[str, int]:
+        with self._stats_lock:
+            return {"hits": self._hits, "misses": self._misses}
+
+    def _count(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = self._open()
+        try:
+            with conn:  # commits on success, rolls back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def _open(self) -> sqlite3.Connection:
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entry ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL, "
+                "accessed_at REAL NOT NULL, hit_count INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_cache_entry_accessed ON cache_entry(accessed_at)"
+            )
+            self._ready = True
+        return conn
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import get_settings
+from app.utils.provider_guard import (
+    ProviderGuard,
+    get_provider_guard,
+    is_provider_failure,
+)
+
+_clients_lock = threading.Lock()
+_clients: dict[str, httpx.Client] = {}
+_async_clients: dict[tuple[str, int], httpx.AsyncClient] = {}
+
+
+def http_request(
+    method: str,
+    url: str,
+    *,
+    timeout: float | None = None,
+    provider: str | None = None,
+    cost: float = 1.0,
+    **kwargs: Any,
+) -> httpx.Response:
+    """
+    Sends a request on the pooled client for the URL's host. Raises
+    httpx.HTTPError for transport failures and non-2xx responses, so callers
+    handle both with one except clause like they did with urllib. With a
+    provider name the request also goes through that provider's rate limit
+    and circuit breaker (ProviderUnavailableError is an httpx.HTTPError too).
+    """
+    guard = get_provider_guard(provider) if provider else None
+    if guard is not None:
+        guard.acquire(cost)
+    try:
+        response = get_http_client(url).request(
+            method, url, timeout=_timeout(timeout), **kwargs
+        )
+    except httpx.TransportError:
+        if guard is not None:
+            guard.record_failure()
+        raise
+    _record_outcome(guard, response)
+    response.raise_for_status()
+    return response
+
+
+async def async_http_request(
+    method: str,
+    url: str,
+    *,
+    timeout: float | None = None,
+    provider: str | None = None,
+    cost: float = 1.0,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Async counterpart of http_request, on an AsyncClient with the same pool settings."""
+    guard = get_provider_guard(provider) if provider else None
+    if guard is not None:
+        await guard.acquire_async(cost)
+    try:
+        response = await get_async_http_client(url).request(
+            method, url, timeout=_timeout(timeout), **kwargs
+        )
+    except httpx.TransportError:
+        if guard is not None:
+            guard.record_failure()
+        raise
+    _record_outcome(guard, response)
+    response.raise_for_status()
+    return response
+
+
+def get_http_client(url: str) -> httpx.Client:
+    # One pool per host keeps connection limits per API and lets repeat calls
+    # reuse a warm keep-alive connection instead of redoing DNS/TCP/TLS.
+    host = _host_key(url)
+    with _clients_lock:
+        client = _clients.get(host)
+        if client is None:
+            # urllib followed redirects (http->https, moved endpoints); keep that.
+            client = httpx.Client(
+                limits=_limits(), timeout=_timeout(None), follow_redirects=True
+            )
+            _clients[host] = client
+        return client
+
+
+def get_async_http_client(url: str) -> httpx.AsyncClient:
+    # Async connections belong to the event loop that opened them.
+    key = (_host_key(url), id(asyncio.get_running_loop()))
+    with _clients_lock:
+        client = _async_clients.get(key)
+        if client is None:
+            client = httpx.AsyncClient(
+                limits=_limits(), timeout=_timeout(None), follow_redirects=True
+            )
+            _async_clients[key] = client
+        return client
+
+
+async def close_http_clients() -> None:
+    loop_id = id(asyncio.get_running_loop())
+    with _clients_lock:
+        clients = list(_clients.values())
+        # Clients opened on other (already finished) loops cannot be awaited here.
+        async_clients = [
+            client for (_, owner), client in _async_clients.items() if owner == loop_id
+        ]
+        _clients.clear()
+        _async_clients.clear()
+    for client in clients:
+        client.close()
+    for async_client in async_clients:
+        await async_client.aclose()
+
+
+def _record_outcome(guard: ProviderGuard | None, response: httpx.Response) -> None:
+    if guard is None:
+        return
+    if is_provider_failure(response.status_code):
+        guard.record_failure()
+    else:
+        guard.record_success()
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _limits() -> httpx.Limits:
+    settings = get_settings()
+    return httpx.Limits(
+        max_connections=settings.http_max_connections_per_host,
+        max_keepalive_connections=settings.http_max_keepalive_per_host,
+        keepalive_expiry=settings.http_keepalive_expiry_sec,
+    )
+
+
+def _timeout(total_sec: float | None) -> httpx.Timeout:
+    settings = get_settings()
+    total = settings.http_timeout_sec if total_sec is None else total_sec
+    return httpx.Timeout(total, connect=min(total, settings.http_connect_timeout_sec))
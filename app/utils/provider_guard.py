@@ -0,0 +1,282 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import httpx
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_guards_lock = threading.Lock()
+_guards: dict[str, "ProviderGuard"] = {}
+_backend: "_MemoryBackend | _SqliteBackend | None" = None
+
+
+class ProviderUnavailableError(httpx.HTTPError):
+    """Raised instead of sending a request the provider's budget or breaker forbids."""
+
+
+@dataclass
+class GuardConfig:
+    rate_per_sec: float
+    burst: float
+    max_wait_sec: float
+    failure_threshold: int
+    reset_sec: float
+
+
+@dataclass
+class _GuardState:
+    tokens: float
+    updated_at: float
+    failures: int = 0
+    open_until: float = 0.0
+
+
+class ProviderGuard:
+    """
+    Token-bucket rate limit plus circuit breaker for one upstream provider.
+    Callers reserve tokens up front and sleep only for their own reservation,
+    so concurrent callers queue fairly without a shared sleep. After
+    failure_threshold consecutive failures the breaker opens and requests fail
+    fast until reset_sec has passed; then a single probe request is let through
+    and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, name: str, config: GuardConfig):
+        self.name = name
+        self.config = config
+        self._rejected = 0
+
+    def acquire(self, cost: float = 1.0) -> None:
+        wait_sec = self._reserve(cost)
+        if wait_sec > 0:
+            time.sleep(wait_sec)
+
+    async def acquire_async(self, cost: float = 1.0) -> None:
+        wait_sec = self._reserve(cost)
+        if wait_sec > 0:
+            await asyncio.sleep(wait_sec)
+
+    def record_success(self) -> None:
+        def update(state: _GuardState) -> None:
+            state.failures = 0
+            state.open_until = 0.0
+
+        _get_backend().update(self.name, self._initial_state, update)
+
+    def record_failure(self) -> None:
+        config = self.config
+
+        def update(state: _GuardState) -> None:
+            state.failures += 1
+            if state.failures >= config.failure_threshold:
+                state.open_until = time.time() + config.reset_sec
+
+        state = _get_backend().update(self.name, self._initial_state, update)
+        if state.failures == config.failure_threshold:
+            logger.warning(
+                "%s: circuit opened after %d consecutive failures",
+                self.name,
+                state.failures,
+            )
+
+    def stats(self) -> dict[str, float | int | str]:
+        state = _get_backend().update(self.name, self._initial_state, self._refill)
+        if state.failures < self.config.failure_threshold:
+            breaker = "closed"
+        elif time.time() < state.open_until:
+            breaker = "open"
+        else:
+            breaker = "half_open"
+        return {
+            "breaker": breaker,
+            "consecutive_failures": state.failures,
+            "tokens": round(state.tokens, 2),
+            "rejected": self._rejected,
+        }
+
+    def _reserve(self, cost: float) -> float:
+        config = self.config
+        outcome: dict[str, float | str] = {}
+
+        def update(state: _GuardState) -> None:
+            now = time.time()
+            self._refill(state)
+            probing = False
+            if state.failures >= config.failure_threshold:
+                if now < state.open_until:
+                    outcome["rejected"] = "circuit open"
+                    return
+                probing = True
+            wait_sec = max(0.0, (cost - state.tokens) / config.rate_per_sec)
+            if wait_sec > config.max_wait_sec:
+                outcome["rejected"] = "rate budget exhausted"
+                return
+            # Tokens may go negative: later callers then wait behind this reservation.
+            state.tokens -= cost
+            if probing:
+                # Keep everyone else failing fast while this probe is in flight.
+                state.open_until = now + config.reset_sec
+            outcome["wait_sec"] = wait_sec
+
+        _get_backend().update(self.name, self._initial_state, update)
+        if "rejected" in outcome:
+            self._rejected += 1
+            raise ProviderUnavailableError(f"{self.name}: {outcome['rejected']}")
+        return float(outcome["wait_sec"])
+
+    def _initial_state(self) -> _GuardState:
+        return _GuardState(tokens=self.config.burst, updated_at=time.time())
+
+    def _refill(self, state: _GuardState) -> None:
+        now = time.time()
+        elapsed = max(0.0, now - state.updated_at)
+        state.tokens = min(
+            self.config.burst, state.tokens + elapsed * self.config.rate_per_sec
+        )
+        state.updated_at = now
+
+
+def get_provider_guard(name: str) -> ProviderGuard:
+    """
+    Returns the guard for a provider. Names like "overpass:<host>" get their
+    own state but share the "overpass" limits from settings.provider_limits.
+    """
+    with _guards_lock:
+        guard = _guards.get(name)
+        if guard is None:
+            guard = ProviderGuard(name, _guard_config(name.split(":", 1)[0]))
+            _guards[name] = guard
+        return guard
+
+
+def provider_guard_stats() -> dict[str, dict[str, float | int | str]]:
+    with _guards_lock:
+        guards = list(_guards.values())
+    return {guard.name: guard.stats() for guard in guards}
+
+
+def is_provider_failure(status_code: int) -> bool:
+    # Client errors such as 404 mean the provider is healthy; throttling and
+    # server errors count towards opening the breaker.
+    return status_code == 429 or status_code >= 500
+
+
+def _guard_config(provider: str) -> GuardConfig:
+    settings = get_settings()
+    overrides = settings.provider_limits.get(provider, {})
+    return GuardConfig(
+        rate_per_sec=float(overrides.get("rate_per_sec", 10.0)),
+        burst=float(overrides.get("burst", 10.0)),
+        max_wait_sec=float(
+            overrides.get("max_wait_sec", settings.provider_max_wait_sec)
+        ),
+        failure_threshold=int(
+            overrides.get(
+                "failure_threshold", settings.provider_breaker_failure_threshold
+            )
+        ),
+        reset_sec=float(overrides.get("reset_sec", settings.provider_breaker_reset_sec)),
+    )
+
+
+def _get_backend() -> "_MemoryBackend | _SqliteBackend":
+    global _backend
+    with _guards_lock:
+        if _backend is None:
+            settings = get_settings()
+            if settings.provider_state_backend == "sqlite":
+                _backend = _SqliteBackend(settings.provider_state_path)
+            else:
+                _backend = _MemoryBackend()
+        return _backend
+
+
+class _MemoryBackend:
+    """Per-process state; each worker enforces the limits on its own."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._states: dict[str, _GuardState] = {}
+
+    def update(
+        self,
+        name: str,
+        initial: Callable[[], _GuardState],
+        fn: Callable[[_GuardState], None],
+    ) -> _GuardState:
+        with self._lock:
+            state = self._states.get(name)
+            if state is None:
+                state = initial()
+                self._states[name] = state
+            fn(state)
+            return _GuardState(**asdict(state))
+
+
+class _SqliteBackend:
+    """
+    State in a local SQLite file so every worker process on the host draws
+    from the same budget and sees the same breaker. Falls back to in-process
+    state if the file cannot be used.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._ready = False
+        self._fallback = _MemoryBackend()
+
+    def update(
+        self,
+        name: str,
+        initial: Callable[[], _GuardState],
+        fn: Callable[[_GuardState], None],
+    ) -> _GuardState:
+        try:
+            with self._connect() as conn:
+                # IMMEDIATE takes the write lock before reading, making the
+                # read-modify-write atomic across processes.
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT tokens, updated_at, failures, open_until "
+                    "FROM provider_state WHERE name = ?",
+                    (name,),
+                ).fetchone()
+                state = _GuardState(*row) if row is not None else initial()
+                fn(state)
+                conn.execute(
+                    "INSERT OR REPLACE INTO provider_state "
+                    "(name, tokens, updated_at, failures, open_until) VALUES (?, ?, ?, ?, ?)",
+                    (name, state.tokens, state.updated_at, state.failures, state.open_until),
+                )
+                conn.execute("COMMIT")
+                return state
+        except (sqlite3.Error, OSError):
+            logger.exception("Provider state store %s failed; using in-process state", self.path)
+            return self._fallback.update(name, initial, fn)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        try:
+            if not self._ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS provider_state ("
+                    "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, "
+                    "failures INTEGER NOT NULL, open_until REAL NOT NULL)"
+                )
+                self._ready = True
+            yield conn
+        finally:
+            conn.close()
@@ -0,0 +1,70 @@
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one execution. The first
+    caller runs the function; callers arriving while it is in flight block
+    until it finishes and share its result.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self._executions = 0
+        self._coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """Returns (result, ran_here)."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                self._coalesced += 1
+                leader = False
+            else:
+                flight = _Flight()
+                self._flights[key] = flight
+                self._executions += 1
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            return flight.result, False
+
+        try:
+            flight.result = fn()
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+            if flight.waiters:
+                logger.info(
+                    "%s: coalesced %d caller(s) into one run for %s",
+                    self.name,
+                    flight.waiters,
+                    key,
+                )
+        return flight.result, True
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._flights),
+            }
@@ -18,7 +18,7 @@ from app.schemas.agent import (
     DiscoveredCommunityProfile,
 )
 from app.schemas.insight import CommunityWebSource
-from app.services.fetchers.geocoding import geocode_community
+from app.services.geocode_service import geocode_cached
 from app.services.scoring_service import PREFERENCE_DIMENSIONS, compute_preference_scores
 from app.tools.community_dimension_tools import (
     DimensionToolResult,
@@ -108,7 +108,7 @@ async def run_community_discovery_workflow(
     tool_calls: list[AgentToolCall] = []
     trace: list[AgentTraceStep] = []
 
-    geocoded = geocode_community(normalized_query)
+    geocoded = geocode_cached(db, normalized_query)
     tool_calls.append(
         AgentToolCall(
             name="geocode_community",
@@ -546,25 +546,28 @@ def _upsert_dimension_scores(
 
     score_input = _metrics_score_input(metrics)
     result_by_dimension = {result.dimension: result for result in tool_results}
+    rows = []
     for dimension in dimensions:
         result = result_by_dimension.get(dimension.dimension)
-        crud.upsert_dimension_score(
-            db=db,
-            community_id=community_id,
-            dimension=dimension.dimension,
-            score_0_100=dimension.score_0_100 or 0.0,
-            summary=dimension.summary,
-            details={
-                "score_input": score_input,
-                "tool": {
-                    "status": result.status if result else "unknown",
-                    "source": result.source if result else "unknown",
-                    "confidence": result.confidence if result else dimension.confidence,
-                    "missing_fields": result.missing_fields if result else [],
+        rows.append(
+            {
+                "community_id": community_id,
+                "dimension": dimension.dimension,
+                "score_0_100": dimension.score_0_100 or 0.0,
+                "summary": dimension.summary,
+                "details": {
+                    "score_input": score_input,
+                    "tool": {
+                        "status": result.status if result else "unknown",
+                        "source": result.source if result else "unknown",
+                        "confidence": result.confidence if result else dimension.confidence,
+                        "missing_fields": result.missing_fields if result else [],
+                    },
                 },
-            },
-            data_origin=dimension.data_origin,
+                "data_origin": dimension.data_origin,
+            }
         )
+    crud.upsert_dimension_scores(db, rows)
 
 
 def _metrics_score_input(metrics) -> dict[str, float | None]:
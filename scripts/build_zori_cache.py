@@ -0,0 +1,34 @@
+import argparse
+
+from app.services.fetchers.zillow_zori import (
+    DEFAULT_ZORI_CACHE_DIR,
+    DEFAULT_ZORI_PATH,
+    build_zori_columnar,
+    compute_zori_trends,
+)
+
+
+def main() -> None:
+    args = _parse_args()
+    store = build_zori_columnar(args.csv, args.cache_dir)
+    trends = compute_zori_trends(store)
+    with_trend = sum(1 for t in trends.values() if t.trend_pct[12] is not None)
+    print(
+        f"Wrote {len(store)} city series x {len(store.dates)} months to {args.cache_dir} "
+        f"({with_trend} with a 12-month trend)"
+    )
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description="Convert the Zillow ZORI city CSV into the memory-mapped columnar cache."
+    )
+    parser.add_argument("--csv", default=DEFAULT_ZORI_PATH, help="ZORI city CSV path.")
+    parser.add_argument(
+        "--cache-dir", default=DEFAULT_ZORI_CACHE_DIR, help="Output directory for values.npy/index.json."
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
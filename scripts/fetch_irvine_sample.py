@@ -2,8 +2,11 @@ import argparse
 
 from sqlalchemy import select
 
+from app.core.config import get_settings
 from app.db.database import Base, SessionLocal, engine
 from app.db.models import Community, CommunityMetrics, DimensionScore
+from app.services.commute_service import commute_minutes_matrix
+from app.services.fetchers.crimegrade import crimegrade_city_slugs, prefetch_crimegrade_pages
 from app.services.ingest_service import ensure_metrics_fresh_with_options, ensure_reviews_fresh
 from scripts.seed_communities import SEED_ROWS
 
@@ -20,6 +23,10 @@ def main() -> None:
         if args.community_id:
             selected_ids = args.community_id
 
+        if not args.skip_external:
+            _prefetch_commutes(db, selected_ids)
+            _prefetch_crimegrade(db, selected_ids)
+
         ttl_hours = 0 if args.force_refresh else None
         for community_id in selected_ids:
             ensure_metrics_fresh_with_options(
@@ -55,6 +62,37 @@ def _parse_args():
     return parser.parse_args()
 
 
+def _prefetch_commutes(db, community_ids: list[str]) -> None:
+    # One batched matrix call warms the per-pair cache the refresh loop reads.
+    settings = get_settings()
+    origins = [
+        (community.center_lat, community.center_lng)
+        for community in db.execute(
+            select(Community).where(Community.community_id.in_(community_ids))
+        ).scalars()
+        if community.center_lat is not None and community.center_lng is not None
+    ]
+    destination = (settings.commute_destination_lat, settings.commute_destination_lng)
+    minutes = commute_minutes_matrix(origins, [destination])
+    found = sum(row[0] is not None for row in minutes)
+    print(f"Prefetched commute minutes for {found}/{len(origins)} communities")
+
+
+def _prefetch_crimegrade(db, community_ids: list[str]) -> None:
+    # One throttled pass per city, so the per-community refreshes read the cache.
+    names_by_city: dict[tuple[str, str], list[str]] = {}
+    for community in db.execute(
+        select(Community).where(Community.community_id.in_(community_ids))
+    ).scalars():
+        if community.city and community.state:
+            names_by_city.setdefault((community.city, community.state), []).append(
+                community.name
+            )
+    for (city, state), names in names_by_city.items():
+        counts = prefetch_crimegrade_pages(crimegrade_city_slugs(city, state, names))
+        print(f"Prefetched CrimeGrade pages for {city}, {state}: {counts}")
+
+
 def _seed_communities(db) -> None:
     for row in SEED_ROWS:
         existing = db.get(Community, row["community_id"])
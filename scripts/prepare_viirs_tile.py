@@ -0,0 +1,62 @@
+import argparse
+
+from app.core.config import get_settings
+from app.services.fetchers.nasa_viirs import (
+    build_viirs_overviews,
+    build_viirs_sat,
+    crop_viirs_raster,
+)
+
+
+def main() -> None:
+    args = _parse_args()
+    settings = get_settings()
+    dst = crop_viirs_raster(
+        args.src or settings.viirs_local_radiance_tif,
+        args.dst or settings.viirs_service_area_tif,
+        settings.viirs_service_area_bboxes,
+        pad_km=args.pad_km if args.pad_km is not None else 2 * settings.viirs_sample_radius_km,
+        downsample=args.downsample,
+    )
+    if dst is None:
+        raise SystemExit("Could not crop VIIRS raster (missing tile or no overlap with service areas).")
+    print(f"Wrote {dst} ({dst.stat().st_size / 1e6:.1f} MB)")
+
+    if not args.no_sat:
+        sidecar = build_viirs_sat(str(dst))
+        if sidecar is not None:
+            print(f"Wrote {sidecar}")
+    for overview in build_viirs_overviews(str(dst), args.overviews):
+        print(f"Wrote {overview}")
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description="Crop the VIIRS radiance tile to the configured service areas."
+    )
+    parser.add_argument("--src", help="Full VIIRS tile (default: VIIRS_LOCAL_RADIANCE_TIF).")
+    parser.add_argument("--dst", help="Cropped output (default: VIIRS_SERVICE_AREA_TIF).")
+    parser.add_argument(
+        "--pad-km",
+        type=float,
+        help="Margin around the service areas (default: twice VIIRS_SAMPLE_RADIUS_KM).",
+    )
+    parser.add_argument(
+        "--downsample",
+        type=int,
+        default=1,
+        help="Average valid pixels in NxN blocks to shrink the output further.",
+    )
+    parser.add_argument(
+        "--overviews",
+        type=int,
+        nargs="*",
+        default=[],
+        help="Also write block-mean overviews at these factors, e.g. --overviews 2 4 8.",
+    )
+    parser.add_argument("--no-sat", action="store_true", help="Skip the summed-area table sidecar.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
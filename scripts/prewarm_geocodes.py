@@ -0,0 +1,62 @@
+import argparse
+
+from sqlalchemy import select
+
+from app.db.database import Base, SessionLocal, engine
+from app.db.models import Community
+from app.services.geocode_service import prewarm_geocodes
+from scripts.seed_communities import SEED_ROWS
+
+
+def main() -> None:
+    args = _parse_args()
+    Base.metadata.create_all(bind=engine, tables=[Base.metadata.tables["geocode_cache"]])
+    db = SessionLocal()
+    try:
+        queries = list(args.name or [])
+        if args.file:
+            with open(args.file, "r", encoding="utf-8") as f:
+                queries.extend(line.strip() for line in f if line.strip())
+        if not queries:
+            queries = _known_queries(db)
+
+        counts = prewarm_geocodes(db, queries, refresh=args.refresh)
+        print(
+            f"Geocoded {len(queries)} queries: {counts['cached']} already cached, "
+            f"{counts['found']} found, {counts['not_found']} not found, {counts['failed']} failed"
+        )
+    finally:
+        db.close()
+
+
+def _known_queries(db) -> list[str]:
+    # Both forms the API sends: bare names (compare/search) and
+    # "name, city, state" (discovery).
+    rows = [(row["name"], row["city"], row["state"]) for row in SEED_ROWS]
+    rows.extend(
+        db.execute(select(Community.name, Community.city, Community.state)).all()
+    )
+    queries = []
+    for name, city, state in rows:
+        queries.append(name)
+        if city or state:
+            queries.append(", ".join(part for part in [name, city, state] if part))
+    return queries
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description="Fill the geocode cache so known places never wait on Nominatim."
+    )
+    parser.add_argument(
+        "--name", action="append", help="Query to geocode (repeatable). Defaults to known communities."
+    )
+    parser.add_argument("--file", help="Text file with one query per line.")
+    parser.add_argument(
+        "--refresh", action="store_true", help="Re-geocode queries that are already cached."
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ DROP TABLE IF EXISTS dimension_score CASCADE;
 DROP TABLE IF EXISTS community_comparison CASCADE;
 DROP TABLE IF EXISTS community_metrics CASCADE;
 DROP TABLE IF EXISTS community CASCADE;
+DROP TABLE IF EXISTS geocode_cache CASCADE;
 
 -- =========================
 -- 1) COMMUNITY
@@ -49,6 +50,8 @@ CREATE TABLE community_metrics (
 
   youtube_video_ids        text,
   youtube_comments         text,
+  youtube_comments_hash    varchar(64),  -- sha256 of youtube_comments
+  reviews_materialized_hash varchar(64), -- youtube_comments_hash last copied into review_post
 
   overall_confidence       double precision,
   details_json             text
@@ -157,6 +160,17 @@ CREATE TABLE community_comparison (
 CREATE UNIQUE INDEX ux_comparison_pair
   ON community_comparison(community_a_id, community_b_id);
 
+-- =========================
+-- 8) GEOCODE_CACHE (Nominatim results, incl. negative answers)
+-- =========================
+CREATE TABLE geocode_cache (
+  query_key    varchar(255) PRIMARY KEY,
+  query        text NOT NULL,
+  result_json  text,            -- NULL = negative result
+  fetched_at   timestamp NOT NULL,
+  expires_at   timestamp NOT NULL
+);
+
 -- Helpful indexes for query speed (optional)
 CREATE INDEX ix_context_by_comm_type
   ON community_context(community_id, context_type);
@@ -0,0 +1,7 @@
+CREATE TABLE IF NOT EXISTS geocode_cache (
+  query_key    varchar(255) PRIMARY KEY,
+  query        text NOT NULL,
+  result_json  text,            -- NULL = negative result
+  fetched_at   timestamp NOT NULL,
+  expires_at   timestamp NOT NULL
+);
@@ -0,0 +1,11 @@
+-- Bulk dimension-score upserts rely on ON CONFLICT (community_id, dimension).
+-- Keep the most recent row per key before adding the index on older databases.
+DELETE FROM dimension_score a
+  USING dimension_score b
+  WHERE a.community_id = b.community_id
+    AND a.dimension = b.dimension
+    AND (COALESCE(a.updated_at, '-infinity'::timestamp), a.score_id)
+      < (COALESCE(b.updated_at, '-infinity'::timestamp), b.score_id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_dimension_score_comm_dim
+  ON dimension_score(community_id, dimension);
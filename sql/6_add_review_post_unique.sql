@@ -0,0 +1,13 @@
+-- Bulk review upserts rely on ON CONFLICT (community_id, platform, external_id).
+-- Keep the oldest row per key before adding the index on older databases.
+DELETE FROM review_post a
+  USING review_post b
+  WHERE a.external_id IS NOT NULL
+    AND a.community_id = b.community_id
+    AND a.platform IS NOT DISTINCT FROM b.platform
+    AND a.external_id = b.external_id
+    AND a.post_id > b.post_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_review_post_platform_external
+  ON review_post(community_id, platform, external_id)
+  WHERE external_id IS NOT NULL;
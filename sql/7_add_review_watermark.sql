@@ -0,0 +1,2 @@
+ALTER TABLE community_metrics ADD COLUMN IF NOT EXISTS youtube_comments_hash varchar(64);
+ALTER TABLE community_metrics ADD COLUMN IF NOT EXISTS reviews_materialized_hash varchar(64);
@@ -17,6 +17,7 @@ DEFAULT_TABLES = [
     "review_signal",
     "dimension_score",
     "community_comparison",
+    "geocode_cache",
 ]
 
 